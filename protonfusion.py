@@ -4,74 +4,556 @@ Proton Fusion Drift - Quantum Evolution Edition
 Doctor Solen DriftCore
 """
 
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
 import pygame
 import numpy as np
+import argparse
+import ctypes
+import hashlib
 import json
 import math
+import multiprocessing
 import sys
 import random
-import os
+import select
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Set as AbstractSet
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import combinations
+from multiprocessing import shared_memory
 from pygame import gfxdraw
-from typing import Dict, List, Tuple, Set, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
 # ======================
 # Constants
 SCREEN_WIDTH, SCREEN_HEIGHT = 1024, 768
+RENDER_RESOLUTION: Optional[Tuple[int, int]] = None  # fixed internal size; None follows the window
+RENDER_SCALE = 1.0  # internal size relative to the window when not fixed
+RENDER_SMOOTH_SCALE = False
+RENDER_RESIZE_SETTLE = 250  # ms a new window size must hold before buffers are reallocated
 FPS = 60
+SIM_TICK_MS = 1000 / FPS  # fixed simulation step; per-tick constants are tuned for 60 Hz
+MAX_SIM_STEPS = 5  # ticks per frame before the simulation is allowed to fall behind
+SIMULATION_OFFLOAD = False
 BG_ALPHA = 180
+BG_OVERLAY_ALPHA = 100
 GRID_ALPHA = 120
 MAX_TRANSITION_TIME = 1000  # ms
+BACKGROUND_COUNT = 4
+DIRTY_RECT_RENDERING = False
+DIRTY_BACKGROUND_INTERVAL = 250  # ms
+DIRTY_TILE_SIZE = 8  # px
+ASSET_SEED = 0
+ASSET_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.asset_cache')
+ASSET_GENERATOR_VERSION = 1
+PERIODIC_TABLE_PATH = 'periodic_table.json'
+TABLE_HOT_RELOAD = True
+TABLE_POLL_INTERVAL = 0.5  # s
+TABLE_RELOAD_SETTLE = 0.1  # s to let an editor finish writing before reparsing
+PROFILE_WINDOW = 240  # frames
+PROFILE_OVERLAY_INTERVAL = 500  # ms
+PROFILE_TRACE_PATH = 'protonfusion_trace_%Y%m%d_%H%M%S.json'
 
 # ======================
 # Load periodic table data with error handling
-try:
-    with open('periodic_table.json') as f:
-        periodic_table: Dict[str, Dict] = json.load(f)
-    if not any(e.get('atomic_number') == 1 for e in periodic_table.values()):
+TABLE_NUMBER_FIELDS = ('atomic_mass', 'electronegativity', 'melting_point', 'boiling_point', 'density')
+TABLE_NMR_NUMBER_FIELDS = ('spin', 'gyromagnetic_ratio')
+TABLE_STRING_FIELDS = ('key', 'symbol', 'name', 'chemical_shift')
+
+def parse_number(value) -> float:
+    """Coerce a JSON value to float: None and junk become NaN, "1/2" becomes 0.5."""
+    if value is None or isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        numerator, _, denominator = str(value).strip().partition('/')
+        return float(numerator) / float(denominator) if denominator else float(numerator)
+    except (ValueError, ZeroDivisionError):
+        return math.nan
+
+def table_to_array(table: Dict[str, Dict], source: str = "table") -> np.ndarray:
+    """Validate a JSON table and flatten it into a structured array, one typed column per field.
+
+    Entries without an integer ``atomic_number`` are dropped; numbers that do
+    not parse are stored as NaN, like missing ones. Both are reported.
+    ``nmr_data`` fields are stored as top-level columns.
+    """
+    rows = []
+    problems: List[str] = []
+    for key, element in table.items():
+        number = element.get('atomic_number') if isinstance(element, dict) else None
+        if not isinstance(number, int) or isinstance(number, bool) or number < 1:
+            problems.append(f"entry {key!r} has no valid atomic_number, skipped")
+            continue
+        nmr = element.get('nmr_data')
+        if not isinstance(nmr, dict):
+            nmr = {}
+        values = []
+        for source_dict, field in ([(element, f) for f in TABLE_NUMBER_FIELDS]
+                                   + [(nmr, f) for f in TABLE_NMR_NUMBER_FIELDS]):
+            raw = source_dict.get(field)
+            value = parse_number(raw)
+            if raw is not None and math.isnan(value):
+                problems.append(f"{element.get('symbol') or key}.{field} = {raw!r} is not a number")
+            values.append(value)
+        rows.append((str(key), number, str(element.get('symbol') or ''), str(element.get('name') or ''),
+                     str(nmr.get('chemical_shift') or ''), *values))
+    if problems:
+        print(f"{source}: {len(problems)} problem(s), treated as missing: " + "; ".join(problems[:5])
+              + (" ..." if len(problems) > 5 else ""), file=sys.stderr)
+    widths = [max([1] + [len(row[i]) for row in rows]) for i in (0, 2, 3, 4)]
+    dtype = np.dtype(
+        [('key', f'<U{widths[0]}'), ('atomic_number', '<i4'), ('symbol', f'<U{widths[1]}'),
+         ('name', f'<U{widths[2]}'), ('chemical_shift', f'<U{widths[3]}')]
+        + [(f, '<f8') for f in TABLE_NUMBER_FIELDS + TABLE_NMR_NUMBER_FIELDS])
+    return np.array(rows, dtype=dtype)
+
+def compiled_table_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.npy'
+
+def compile_periodic_table(path: str, output: Optional[str] = None) -> str:
+    """Write ``path`` as a memory-mappable ``.npy`` next to it; returns the output path."""
+    table = read_periodic_table(path)
+    output = output or compiled_table_path(path)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, table_to_array(table, path))
+    os.replace(tmp_path, output)
+    return output
+
+def load_compiled_table(path: str) -> Optional[np.ndarray]:
+    """Memory-map the compiled form of ``path`` if it exists and is not older than the JSON."""
+    compiled = compiled_table_path(path)
+    try:
+        if os.path.exists(path) and os.path.getmtime(compiled) < os.path.getmtime(path):
+            return None
+        columns = np.load(compiled, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    required = {'atomic_number', *TABLE_STRING_FIELDS, *TABLE_NUMBER_FIELDS, *TABLE_NMR_NUMBER_FIELDS}
+    if columns.dtype.names is None or not required <= set(columns.dtype.names):
+        print(f"Ignoring {compiled}: not a compiled periodic table", file=sys.stderr)
+        return None
+    return columns
+
+def read_periodic_table(path: str) -> Dict[str, Dict]:
+    """Parse a JSON table, raising instead of falling back on bad data."""
+    with open(path) as f:
+        table = json.load(f)
+    if not isinstance(table, dict):
+        raise ValueError("JSON must be an object of element entries")
+    if not any(isinstance(e, dict) and e.get('atomic_number') == 1 for e in table.values()):
         raise ValueError("JSON must contain at least Hydrogen (atomic_number 1)")
-except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
-    print(f"Error loading periodic table: {e}")
-    print("Creating minimal default table with just Hydrogen")
-    periodic_table = {
-        "0": {
-            "name": "Hydrogen",
-            "symbol": "H",
-            "atomic_number": 1,
-            "atomic_mass": 1.008,
-            "electronegativity": 2.20,
-            "melting_point": 14.01,
-            "boiling_point": 20.28,
-            "density": 0.00008988,
-            "nmr_data": {
-                "spin": "1/2",
-                "gyromagnetic_ratio": 26.752,
-                "chemical_shift": "0.0"
+    return table
+
+def load_periodic_table(path: str = PERIODIC_TABLE_PATH) -> Dict[str, Dict]:
+    try:
+        return read_periodic_table(path)
+    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+        print(f"Error loading periodic table: {e}", file=sys.stderr)
+        print("Creating minimal default table with just Hydrogen", file=sys.stderr)
+        return {
+            "0": {
+                "name": "Hydrogen",
+                "symbol": "H",
+                "atomic_number": 1,
+                "atomic_mass": 1.008,
+                "electronegativity": 2.20,
+                "melting_point": 14.01,
+                "boiling_point": 20.28,
+                "density": 0.00008988,
+                "nmr_data": {
+                    "spin": "1/2",
+                    "gyromagnetic_ratio": 26.752,
+                    "chemical_shift": "0.0"
+                }
             }
         }
-    }
 
 # ======================
-# Game Setup
-pygame.init()
-pygame.mixer.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
-pygame.display.set_caption("Proton Fusion Drift - Quantum Evolution Edition")
-clock = pygame.time.Clock()
-
-# Load fonts
-try:
-    title_font = pygame.font.Font(None, 48)
-    element_font = pygame.font.Font(None, 72)
-    info_font = pygame.font.Font(None, 28)
-    small_font = pygame.font.Font(None, 22)
-    grid_font = pygame.font.Font(None, 18)
-except:
-    print("Font loading failed, using system defaults")
-    title_font = pygame.font.SysFont("Arial", 48)
-    element_font = pygame.font.SysFont("Arial", 72)
-    info_font = pygame.font.SysFont("Arial", 28)
-    small_font = pygame.font.SysFont("Arial", 22)
-    grid_font = pygame.font.SysFont("Arial", 18)
+# Element Records
+def particle_color(atomic_number: int, atomic_mass: Optional[float],
+                   electronegativity: float) -> Tuple[int, int, int]:
+    return (
+        min(255, int(electronegativity * 80)),
+        min(255, 50 + int((atomic_number % 10) * 20)),
+        min(255, 100 + int((atomic_mass or 1) % 100))
+    )
+
+def element_tone(atomic_number: int, gyromagnetic_ratio: Optional[float]) -> Tuple[float, float, str]:
+    """Frequency, duration and wave type of an element's tone."""
+    gyromagnetic = abs(gyromagnetic_ratio or 10)
+    base_freq = 220 + (atomic_number * 5)
+    frequency = base_freq * (1 + gyromagnetic / 100)
+    wave_type = (
+        'sine' if atomic_number <= 2 else
+        'triangle' if atomic_number <= 10 else
+        'square' if atomic_number <= 18 else
+        'sawtooth'
+    )
+    duration = 0.3 + (0.7 * (1 - (atomic_number % 10) / 10))
+    return frequency, duration, wave_type
+
+class ElementRecord:
+    """One normalized, immutable element with its render and audio properties precomputed.
+
+    Measured values are floats, or None when the table has no value, except
+    ``electronegativity``, which defaults to 1.0 as the game has always
+    treated it. Per-frame code only reads these fields.
+    """
+    __slots__ = ('key', 'atomic_number', 'symbol', 'name', 'atomic_mass', 'electronegativity',
+                 'melting_point', 'boiling_point', 'density', 'spin', 'gyromagnetic_ratio',
+                 'chemical_shift', 'nucleus_radius', 'nucleus_color', 'particle_color',
+                 'tone_frequency', 'tone_duration', 'wave_type')
+    SOURCE_FIELDS = ('key', 'atomic_number', 'symbol', 'name', 'chemical_shift',
+                     *TABLE_NUMBER_FIELDS, *TABLE_NMR_NUMBER_FIELDS)
+
+    def __init__(self, key: str, atomic_number: int, symbol: str, name: str,
+                 chemical_shift: str = '', **numbers: Optional[float]):
+        electronegativity = numbers.get('electronegativity') or 1.0
+        atomic_mass = numbers.get('atomic_mass')
+        log_mass = math.log(atomic_mass) if atomic_mass and atomic_mass > 0 else 0.0
+        red = int(min(255, electronegativity * 60))
+        fields = dict(
+            key=key, atomic_number=atomic_number, symbol=symbol, name=name,
+            chemical_shift=chemical_shift,
+            **{f: numbers.get(f) for f in TABLE_NUMBER_FIELDS + TABLE_NMR_NUMBER_FIELDS},
+            nucleus_radius=10 + min(20, log_mass * 2),
+            nucleus_color=(red, 50, 255 - red),
+            particle_color=particle_color(atomic_number, atomic_mass, electronegativity),
+        )
+        fields['electronegativity'] = electronegativity
+        fields['tone_frequency'], fields['tone_duration'], fields['wave_type'] = element_tone(
+            atomic_number, numbers.get('gyromagnetic_ratio'))
+        for field, value in fields.items():
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def from_columns(cls, columns: np.ndarray) -> List['ElementRecord']:
+        """One record per row of a compiled table (see ``table_to_array``)."""
+        def column(name: str) -> list:
+            values = columns[name]
+            if values.dtype.kind == 'f':
+                return np.where(np.isnan(values), None, values).tolist()
+            return values.tolist()
+        return [cls(**dict(zip(cls.SOURCE_FIELDS, row)))
+                for row in zip(*(column(f) for f in cls.SOURCE_FIELDS))]
+
+    def source(self) -> Tuple:
+        """The table values this record was built from, in ``SOURCE_FIELDS`` order."""
+        return tuple(getattr(self, f) for f in self.SOURCE_FIELDS)
+
+    @property
+    def tone(self) -> Tuple[float, float, str]:
+        return self.tone_frequency, self.tone_duration, self.wave_type
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (_restore_element_record, (tuple(getattr(self, f) for f in self.__slots__),))
+
+    def __repr__(self) -> str:
+        return f"ElementRecord({self.atomic_number}, {self.symbol!r}, {self.name!r})"
+
+def _restore_element_record(values: Tuple) -> ElementRecord:
+    record = object.__new__(ElementRecord)
+    for field, value in zip(ElementRecord.__slots__, values):
+        object.__setattr__(record, field, value)
+    return record
+
+class ElementIndex:
+    """Lookups and navigation order over one periodic table, built once at load.
+
+    Every table variant (periodic_table.json, periodic_table_nmr_full.json,
+    ...) is keyed by atomic number here, so next/previous navigation and
+    symbol or name lookups are constant time regardless of the JSON keys.
+    The compiled ``columns`` are only read while building the records, so a
+    memory-mapped table is released once the index exists. Records whose
+    data is unchanged from ``previous`` are reused as-is.
+    """
+    def __init__(self, columns: np.ndarray, previous: Optional['ElementIndex'] = None):
+        reusable = {}
+        if previous is not None:
+            reusable = {record.source(): record for record in previous.by_number.values()}
+        self.by_number: Dict[int, ElementRecord] = {}
+        self.key_by_number: Dict[int, str] = {}
+        self.by_symbol: Dict[str, ElementRecord] = {}
+        self.by_name: Dict[str, ElementRecord] = {}
+        for element in ElementRecord.from_columns(columns):
+            element = reusable.get(element.source(), element)
+            number = element.atomic_number
+            if number in self.by_number:
+                continue
+            self.by_number[number] = element
+            self.key_by_number[number] = element.key
+            if element.symbol:
+                self.by_symbol[element.symbol.lower()] = element
+            if element.name:
+                self.by_name[element.name.lower()] = element
+        self.order: List[int] = sorted(self.by_number)
+        self.position: Dict[int, int] = {number: i for i, number in enumerate(self.order)}
+
+    @classmethod
+    def load(cls, path: str = PERIODIC_TABLE_PATH) -> 'ElementIndex':
+        """Load the compiled table for ``path`` if it is current, else parse the JSON."""
+        columns = load_compiled_table(path)
+        if columns is not None and 1 in columns['atomic_number']:
+            return cls(columns)
+        return cls(table_to_array(load_periodic_table(path), path))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, atomic_number: int) -> bool:
+        return atomic_number in self.by_number
+
+    def __getitem__(self, atomic_number: int) -> ElementRecord:
+        return self.by_number[atomic_number]
+
+    def symbol(self, symbol: str) -> Optional[ElementRecord]:
+        return self.by_symbol.get(symbol.lower())
+
+    def name(self, name: str) -> Optional[ElementRecord]:
+        return self.by_name.get(name.lower())
+
+    def step(self, atomic_number: int, offset: int) -> ElementRecord:
+        index = (self.position[atomic_number] + offset) % len(self.order)
+        return self.by_number[self.order[index]]
+
+    def next(self, atomic_number: int) -> ElementRecord:
+        return self.step(atomic_number, 1)
+
+    def previous(self, atomic_number: int) -> ElementRecord:
+        return self.step(atomic_number, -1)
+
+# ======================
+# Table Hot Reload
+IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x002, 0x008, 0x080, 0x100
+
+def open_inotify(directory: str) -> Optional[int]:
+    """Non-blocking inotify descriptor watching ``directory``, or None where unavailable."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+class TableWatcher:
+    """Rebuilds the element index in the background when the table file changes.
+
+    The table's directory is watched with inotify where available (editors
+    often replace files by rename), otherwise the file is polled every
+    ``interval`` seconds. A changed table is parsed and normalized on the
+    watcher thread; the main loop collects the new index with ``take``
+    between frames. Files that fail to parse are reported and skipped, so a
+    half-saved edit never replaces a working table.
+    """
+    def __init__(self, path: str, interval: float = TABLE_POLL_INTERVAL):
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self.signature = self.stat()
+        self.pending: Optional[ElementIndex] = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def start(self) -> None:
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._watch, daemon=True)
+            self.thread.start()
+
+    def stop(self) -> None:
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def take(self) -> Optional[ElementIndex]:
+        """The newest reloaded index, once; None if nothing changed."""
+        with self.lock:
+            index, self.pending = self.pending, None
+        return index
+
+    def _watch(self) -> None:
+        fd = open_inotify(os.path.dirname(self.path))
+        try:
+            while not self.stopping.is_set():
+                if fd is None:
+                    self.stopping.wait(self.interval)
+                elif select.select([fd], [], [], self.interval)[0]:
+                    self.stopping.wait(TABLE_RELOAD_SETTLE)
+                    self._drain(fd)
+                self._check()
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def _drain(self, fd: int) -> None:
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _check(self) -> None:
+        signature = self.stat()
+        if signature is None or signature == self.signature:
+            return
+        self.signature = signature
+        try:
+            with self.lock:
+                previous = self.pending or app.element_index
+            table = read_periodic_table(self.path)
+            index = ElementIndex(table_to_array(table, self.path), previous)
+        except Exception as e:
+            # Anything escaping here would end the thread and hot reload with it.
+            print(f"Table reload skipped, keeping the current table: {e!r}", file=sys.stderr)
+            return
+        with self.lock:
+            self.pending = index
+        print(f"Reloaded {self.path}: {len(index)} elements", file=sys.stderr)
+
+# ======================
+# Application Setup
+class Fonts:
+    """HUD fonts, loaded when first needed."""
+    def __init__(self):
+        pygame.font.init()
+        try:
+            self.title = pygame.font.Font(None, 48)
+            self.element = pygame.font.Font(None, 72)
+            self.info = pygame.font.Font(None, 28)
+            self.small = pygame.font.Font(None, 22)
+            self.grid = pygame.font.Font(None, 18)
+        except:
+            print("Font loading failed, using system defaults", file=sys.stderr)
+            self.title = pygame.font.SysFont("Arial", 48)
+            self.element = pygame.font.SysFont("Arial", 72)
+            self.info = pygame.font.SysFont("Arial", 28)
+            self.small = pygame.font.SysFont("Arial", 22)
+            self.grid = pygame.font.SysFont("Arial", 18)
+
+class App:
+    """Owns the window, fonts, element table and long-lived subsystems.
+
+    Nothing is created at import. Each ``init_*`` stage runs either when
+    called explicitly or the first time the matching attribute is used, so
+    tools and tests can build a ``GameState`` without opening a window or
+    touching the audio device.
+    """
+    def __init__(self, table_path: str = PERIODIC_TABLE_PATH):
+        self.table_path = table_path
+        self._element_index: Optional['ElementIndex'] = None
+        self._screen: Optional[pygame.Surface] = None
+        self._clock: Optional[pygame.time.Clock] = None
+        self._fonts: Optional[Fonts] = None
+        self._game_state: Optional['GameState'] = None
+        self._sound_bank: Optional['SoundBank'] = None
+        self._synth: Optional['StreamingSynth'] = None
+
+    def init_pygame(self) -> None:
+        if not pygame.get_init():
+            pygame.init()
+
+    def init_display(self) -> pygame.Surface:
+        if self._screen is None:
+            self.init_pygame()
+            self._screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+            pygame.display.set_caption("Proton Fusion Drift - Quantum Evolution Edition")
+            self._clock = pygame.time.Clock()
+        return self._screen
+
+    def init_audio(self) -> None:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+    @property
+    def element_index(self) -> 'ElementIndex':
+        if self._element_index is None:
+            self._element_index = ElementIndex.load(self.table_path)
+        return self._element_index
+
+    @element_index.setter
+    def element_index(self, index: 'ElementIndex') -> None:
+        self._element_index = index
+
+    @property
+    def screen(self) -> pygame.Surface:
+        return self.init_display()
+
+    @property
+    def clock(self) -> pygame.time.Clock:
+        self.init_display()
+        return self._clock
+
+    @property
+    def fonts(self) -> Fonts:
+        if self._fonts is None:
+            self._fonts = Fonts()
+        return self._fonts
+
+    @property
+    def game_state(self) -> 'GameState':
+        if self._game_state is None:
+            self._game_state = GameState()
+        return self._game_state
+
+    @game_state.setter
+    def game_state(self, state: 'GameState') -> None:
+        self._game_state = state
+
+    @property
+    def sound_bank(self) -> 'SoundBank':
+        if self._sound_bank is None:
+            self.init_audio()
+            self._sound_bank = SoundBank()
+        return self._sound_bank
+
+    @property
+    def synth(self) -> 'StreamingSynth':
+        if self._synth is None:
+            self.init_audio()
+            self._synth = StreamingSynth()
+        return self._synth
+
+    def shutdown(self) -> None:
+        """Stop only the subsystems that were started, then pygame."""
+        if self._sound_bank is not None:
+            self._sound_bank.stop()
+        if self._synth is not None:
+            self._synth.stop()
+        if self._game_state is not None and self._game_state.offload is not None:
+            self._game_state.offload.close()
+        pygame.quit()
+
+app = App()
 
 # Colors
 BACKGROUND = (10, 10, 30)
@@ -101,157 +583,581 @@ GRID_COLORS = [
     (80, 80, 50, 120)
 ]
 
+# ======================
+# HUD Surface Cache
+class HudCache:
+    """LRU cache of rendered text and HUD panel surfaces.
+
+    Text is keyed on (font, string, color), so static and rarely-changing
+    HUD elements are rasterized once and only blitted afterwards.
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[Tuple, pygame.Surface]' = OrderedDict()
+
+    def get(self, key: Tuple, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            return surface
+        surface = build()
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def text(self, font: pygame.font.Font, string: str, color: Tuple) -> pygame.Surface:
+        return self.get(('text', font, string, color), lambda: font.render(string, True, color))
+
+    def panel(self, size: Tuple[int, int], fill: Tuple[int, int, int, int] = (20, 10, 40, 180),
+              border: Tuple[int, int, int, int] = (100, 80, 150, 150)) -> pygame.Surface:
+        def build() -> pygame.Surface:
+            panel = pygame.Surface(size, pygame.SRCALPHA)
+            panel.fill(fill)
+            pygame.draw.rect(panel, border, panel.get_rect(), 1)
+            return panel
+        return self.get(('panel', size, fill, border), build)
+
+hud_cache = HudCache()
+
+# ======================
+# Frame Profiling
+class FrameProfiler:
+    """Per-stage frame timings with a rolling overlay and optional trace export.
+
+    Stage times are summed per frame and kept for the last ``window`` frames.
+    While a trace is open every span is also written out, either as a Chrome
+    trace (``chrome://tracing`` / Perfetto) or as JSON lines.
+    """
+    def __init__(self, window: int = PROFILE_WINDOW):
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.current: Dict[str, float] = {}
+        self.frame = 0
+        self.frame_start = 0
+        self.origin = time.perf_counter_ns()
+        self.show_overlay = False
+        self.overlay: Optional[pygame.Surface] = None
+        self.overlay_time = -PROFILE_OVERLAY_INTERVAL
+        self.trace_file = None
+        self.trace_format = 'chrome'
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter_ns())
+
+    def record(self, name: str, start: int, end: int) -> None:
+        self.current[name] = self.current.get(name, 0.0) + (end - start) / 1e6
+        if self.trace_file is not None:
+            self.write_span(name, start, end)
+
+    def begin_frame(self) -> None:
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self) -> None:
+        end = time.perf_counter_ns()
+        self.record('frame', self.frame_start, end)
+        for name, ms in self.current.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(ms)
+        self.current = {}
+        self.frame += 1
+
+    def percentiles(self, name: str) -> Tuple[float, float, float]:
+        values = self.samples.get(name)
+        if not values:
+            return (0.0, 0.0, 0.0)
+        p50, p95, p99 = np.percentile(np.fromiter(values, dtype=np.float64), (50, 95, 99))
+        return float(p50), float(p95), float(p99)
+
+    def start_trace(self, path: str) -> None:
+        self.stop_trace()
+        self.trace_format = 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'chrome'
+        self.trace_file = open(path, 'w')
+        if self.trace_format == 'chrome':
+            self.trace_file.write('[\n')
+        print(f"Recording frame trace to {path}", file=sys.stderr)
+
+    def stop_trace(self) -> None:
+        if self.trace_file is None:
+            return
+        if self.trace_format == 'chrome':
+            self.trace_file.write(json.dumps({'name': 'trace_end', 'ph': 'i', 's': 'g', 'pid': 0, 'tid': 0,
+                                              'ts': (time.perf_counter_ns() - self.origin) / 1000}))
+            self.trace_file.write('\n]\n')
+        self.trace_file.close()
+        self.trace_file = None
+
+    def write_span(self, name: str, start: int, end: int) -> None:
+        start_us = (start - self.origin) / 1000
+        duration_us = (end - start) / 1000
+        if self.trace_format == 'chrome':
+            event = {'name': name, 'ph': 'X', 'pid': 0, 'tid': 0, 'ts': start_us,
+                     'dur': duration_us, 'args': {'frame': self.frame}}
+            self.trace_file.write(json.dumps(event) + ',\n')
+        else:
+            event = {'frame': self.frame, 'stage': name, 'start_us': start_us, 'dur_us': duration_us}
+            self.trace_file.write(json.dumps(event) + '\n')
+
+    def overlay_rect(self, surface: pygame.Surface) -> pygame.Rect:
+        height = 30 + 18 * len(self.samples)
+        return pygame.Rect(surface.get_width() - 330, 50, 320, height)
+
+    def draw_overlay(self, surface: pygame.Surface, current_time: float) -> None:
+        if not self.show_overlay:
+            return
+        if self.overlay is None or current_time - self.overlay_time >= PROFILE_OVERLAY_INTERVAL:
+            self.overlay_time = current_time
+            rect = self.overlay_rect(surface)
+            overlay = hud_cache.panel(rect.size).copy()
+            header = app.fonts.small.render(f"{'stage':<16}{'p50':>7}{'p95':>7}{'p99':>7} ms", True, HIGHLIGHT)
+            overlay.blit(header, (8, 6))
+            for i, name in enumerate(sorted(self.samples, key=lambda n: (n != 'frame', n))):
+                p50, p95, p99 = self.percentiles(name)
+                line = app.fonts.grid.render(f"{name:<16}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}", True, TEXT_COLOR)
+                overlay.blit(line, (8, 26 + i * 18))
+            self.overlay = overlay
+        surface.blit(self.overlay, self.overlay_rect(surface))
+
+profiler = FrameProfiler()
+
+# ======================
+# Asset Cache
+class AssetCache:
+    """On-disk cache of generated arrays, memory-mapped back in on startup.
+
+    Each entry is a ``.npy`` file whose name encodes the asset kind, the
+    generator version and the generation parameters (resolution, seed, ...),
+    so changing any of them misses the cache and regenerates. Files left
+    behind by older generator versions are removed on first use.
+    """
+    def __init__(self, directory: str = ASSET_CACHE_DIR, version: int = ASSET_GENERATOR_VERSION):
+        self.directory = directory
+        self.version = version
+        self._pruned = False
+
+    def path(self, kind: str, *params) -> str:
+        name = "-".join([kind, f"v{self.version}", *(str(p) for p in params)])
+        return os.path.join(self.directory, name + ".npy")
+
+    def load_or_build(self, kind: str, params: Tuple, build: Callable[[], np.ndarray]) -> np.ndarray:
+        path = self.path(kind, *params)
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            pass
+        array = build()
+        self.store(path, array)
+        return array
+
+    def store(self, path: str, array: np.ndarray) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.prune()
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Asset cache write failed: {e}", file=sys.stderr)
+
+    def evict(self, kind: str, keep: str) -> None:
+        """Remove ``kind`` entries whose parameters do not include ``keep``."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(kind) and name.endswith(".npy") and f"-{keep}-" not in name:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def prune(self) -> None:
+        if self._pruned:
+            return
+        self._pruned = True
+        current = f"-v{self.version}-"
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy") and current not in name:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+# ======================
+# Procedural Background Generation
+def generate_background_pixels(index: int, width: int, height: int,
+                               seed: Optional[int] = None) -> np.ndarray:
+    """Build background ``index`` as a ``(width, height, 3)`` surfarray-ordered array.
+
+    Index 0 is the dotted default background; the others are the diagonal
+    lattice patterns. The same seed always yields the same pixels.
+    """
+    rng = np.random.default_rng(None if seed is None else [seed, index])
+    pixels = np.empty((width, height, 3), dtype=np.uint8)
+    
+    if index == 0:
+        pixels[:] = (20, 10, 40)
+        dots = pixels[::5, ::5]
+        intensity = rng.integers(10, 31, dots.shape[:2])
+        dots[..., 0] = intensity
+        dots[..., 1] = intensity // 2
+        dots[..., 2] = intensity * 2
+        return pixels
+    
+    i = index - 1
+    pixels[:] = (10+i*5, 20-i*3, 30+i*2)
+    xs, ys = np.meshgrid(np.arange(0, width, 10), np.arange(0, height, 10), indexing='ij')
+    xs, ys = xs.ravel(), ys.ravel()
+    lattice = ((xs + ys) % 40 < 20) | (np.abs(xs - ys) % 40 < 20)
+    xs, ys = xs[lattice], ys[lattice]
+    
+    n = len(xs)
+    intensity = 50 + (xs + ys) % 50
+    colors = np.empty((n, 3), dtype=np.uint8)
+    colors[:, 0] = np.clip(intensity + rng.integers(-20, 21, n), 0, 255)
+    colors[:, 1] = np.clip(intensity//2 + rng.integers(-10, 11, n), 0, 255)
+    colors[:, 2] = np.clip(intensity*2 + rng.integers(-20, 21, n), 0, 255)
+    radius = 2 + (xs * ys) % 3
+    
+    reach = int(radius.max(initial=0))
+    for dx in range(-reach, reach + 1):
+        for dy in range(-reach, reach + 1):
+            hit = dx*dx + dy*dy <= radius*radius
+            px, py = xs[hit] + dx, ys[hit] + dy
+            inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            pixels[px[inside], py[inside]] = colors[hit][inside]
+    return pixels
+
 # ======================
 # Dynamic Background System
 class DynamicBackground:
-    def __init__(self):
-        self.backgrounds: List[pygame.Surface] = []
+    def __init__(self, seed: Optional[int] = None, lazy: bool = False,
+                 cache: Optional[AssetCache] = None):
+        self.backgrounds: List[Optional[pygame.Surface]] = []
+        self.seed = seed
+        self.cache = cache if seed is not None else None
+        self.lazy = lazy
         self.current_bg = 0
         self.bg_offset = [0, 0]
         self.bg_speed = 0.5
+        self.size = (SCREEN_WIDTH, SCREEN_HEIGHT)
         self.load_backgrounds()
-        self.bg_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.baked: Dict[Tuple[int, int], pygame.Surface] = {}
         self.bg_distortion = 0.0
         self.bg_distortion_speed = 0.02
         self.bg_alpha = BG_ALPHA
         
+    def generate(self, index: int, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+        width, height = size or self.size
+        if self.cache is None:
+            return pygame.surfarray.make_surface(
+                generate_background_pixels(index, width, height, self.seed))
+        # Cached as raw RGB rows so the mapped file backs the surface directly.
+        rows = self.cache.load_or_build(
+            f"background{index}", (f"{width}x{height}", self.seed),
+            lambda: np.ascontiguousarray(
+                generate_background_pixels(index, width, height, self.seed)
+                .transpose(1, 0, 2)))
+        return pygame.image.frombuffer(rows, (width, height), 'RGB')
+    
     def load_backgrounds(self) -> None:
+        """Generate the default background now and the rest now or in a worker thread."""
+        size = self.size
         try:
-            default_bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            default_bg.fill((20, 10, 40))
-            
-            for x in range(0, SCREEN_WIDTH, 5):
-                for y in range(0, SCREEN_HEIGHT, 5):
-                    intensity = random.randint(10, 30)
-                    default_bg.set_at((x, y), (intensity, intensity//2, intensity*2))
-            
-            self.backgrounds.append(default_bg)
-            
-            for i in range(3):
-                bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                bg.fill((10+i*5, 20-i*3, 30+i*2))
-                
-                for x in range(0, SCREEN_WIDTH, 10):
-                    for y in range(0, SCREEN_HEIGHT, 10):
-                        if (x + y) % 40 < 20 or abs(x - y) % 40 < 20:
-                            intensity = 50 + (x + y) % 50
-                            r = min(255, intensity + random.randint(-20, 20))
-                            g = min(255, intensity//2 + random.randint(-10, 10))
-                            b = min(255, intensity*2 + random.randint(-20, 20))
-                            pygame.draw.circle(bg, (r, g, b), (x, y), 2 + (x*y) % 3)
-                
-                self.backgrounds.append(bg)
-                
+            backgrounds = [self.generate(0, size)]
+            if self.lazy:
+                backgrounds.extend([None] * (BACKGROUND_COUNT - 1))
+                self.backgrounds = backgrounds
+                threading.Thread(target=self._generate_remaining, args=(backgrounds, size),
+                                 daemon=True).start()
+            else:
+                self._generate_remaining(backgrounds, size)
+                self.backgrounds = backgrounds
         except Exception as e:
-            print(f"Background loading error: {e}")
-            bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            print(f"Background loading error: {e}", file=sys.stderr)
+            bg = pygame.Surface(size)
             bg.fill((20, 10, 40))
-            self.backgrounds.append(bg)
+            self.backgrounds = [bg]
+    
+    def _generate_remaining(self, backgrounds: List[Optional[pygame.Surface]],
+                            size: Tuple[int, int]) -> None:
+        for index in range(1, BACKGROUND_COUNT):
+            bg = self.generate(index, size)
+            if self.lazy:
+                backgrounds[index] = bg
+            else:
+                backgrounds.append(bg)
+    
+    def resize(self, size: Tuple[int, int]) -> None:
+        """Regenerate the backgrounds for a new render size (a no-op if unchanged)."""
+        if size == self.size:
+            return
+        self.size = size
+        self.baked = {}
+        self.load_backgrounds()
+        if self.cache is not None:
+            # Keep one resolution on disk, or drag-resizing would fill it.
+            self.cache.evict("background", f"{size[0]}x{size[1]}")
     
     def update(self) -> None:
         self.bg_offset[0] += self.bg_speed
         self.bg_offset[1] += self.bg_speed * 0.7
         self.bg_distortion += self.bg_distortion_speed
         
-        if self.bg_offset[0] > SCREEN_WIDTH:
-            self.bg_offset[0] -= SCREEN_WIDTH
-        if self.bg_offset[1] > SCREEN_HEIGHT:
-            self.bg_offset[1] -= SCREEN_HEIGHT
+        width, height = self.size
+        if self.bg_offset[0] > width:
+            self.bg_offset[0] -= width
+        if self.bg_offset[1] > height:
+            self.bg_offset[1] -= height
     
-    def draw(self, surface: pygame.Surface) -> None:
-        bg = self.backgrounds[self.current_bg % len(self.backgrounds)]
-        temp_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        
-        for x in range(-1, 2):
-            for y in range(-1, 2):
-                pos_x = x * SCREEN_WIDTH + self.bg_offset[0]
-                pos_y = y * SCREEN_HEIGHT + self.bg_offset[1]
-                distort_x = math.sin(self.bg_distortion + x * 0.5) * 5
-                distort_y = math.cos(self.bg_distortion + y * 0.5) * 5
-                temp_surface.blit(bg, (pos_x + distort_x, pos_y + distort_y))
-        
-        temp_surface.set_alpha(self.bg_alpha)
-        surface.blit(temp_surface, (0, 0))
+    def bake(self, index: int) -> pygame.Surface:
+        """Fold the background alpha and the dark overlay into one opaque surface.
+
+        Blitting the result with a single surface alpha gives the same pixels
+        as blending the background at ``bg_alpha`` and then the overlay.
+        """
+        key = (index, self.bg_alpha)
+        baked = self.baked.get(key)
+        if baked is not None:
+            return baked
+        bg_alpha = self.bg_alpha / 255
+        overlay_alpha = BG_OVERLAY_ALPHA / 255
+        combined = 1 - (1 - bg_alpha) * (1 - overlay_alpha)
+        baked = self.backgrounds[index].copy()
+        if combined > 0:
+            scale = round(255 * bg_alpha * (1 - overlay_alpha) / combined)
+            baked.fill((scale, scale, scale), special_flags=pygame.BLEND_RGB_MULT)
+        if pygame.display.get_surface() is not None:
+            baked = baked.convert()
+        baked.set_alpha(round(255 * combined))
+        self.baked = {k: v for k, v in self.baked.items() if k[1] == self.bg_alpha}
+        self.baked[key] = baked
+        return baked
+    
+    def scroll_position(self, alpha: float = 1.0) -> Tuple[int, int]:
+        """Scroll offset ``alpha`` of the way from the previous tick to the current one."""
+        lag = 1.0 - alpha
+        distortion = self.bg_distortion - self.bg_distortion_speed * lag
+        return (int(self.bg_offset[0] - self.bg_speed * lag + math.sin(distortion) * 5),
+                int(self.bg_offset[1] - self.bg_speed * 0.7 * lag + math.cos(distortion) * 5))
+    
+    def draw(self, surface: pygame.Surface, position: Optional[Tuple[int, int]] = None,
+             alpha: float = 1.0) -> None:
+        self.resize(surface.get_size())
+        index = self.current_bg % len(self.backgrounds)
+        if self.backgrounds[index] is None:
+            index = 0
+        baked = self.bake(index)
+        width, height = baked.get_size()
         
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 100))
-        surface.blit(overlay, (0, 0))
+        x, y = position if position is not None else self.scroll_position(alpha)
+        ox, oy = x % width, y % height
+        surface.blits((
+            (baked, (ox, oy), (0, 0, width - ox, height - oy)),
+            (baked, (0, oy), (width - ox, 0, ox, height - oy)),
+            (baked, (ox, 0), (0, height - oy, width - ox, oy)),
+            (baked, (0, 0), (width - ox, height - oy, ox, oy)),
+        ), doreturn=False)
 
 # ======================
 # Quantum Puzzle Grid System
+class ActiveCellView(AbstractSet):
+    """Read-only set of ``(x, y)`` cells derived from a grid's active mask."""
+    def __init__(self, grid: 'QuantumGrid'):
+        self.grid = grid
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.grid.active))
+
+    def __contains__(self, cell) -> bool:
+        x, y = cell
+        grid = self.grid
+        return 0 <= x < grid.width and 0 <= y < grid.height and bool(grid.active[x * grid.height + y])
+
+    def __iter__(self):
+        height = self.grid.height
+        for i in np.flatnonzero(self.grid.active).tolist():
+            yield (i // height, i % height)
+
 class QuantumGrid:
-    def __init__(self, width: int = 10, height: int = 8):
+    """Grid of pulsing cells held as flat NumPy arrays.
+
+    Cell ``(x, y)`` lives at index ``x * height + y``; cells unlock in index
+    order as the atomic number grows.
+    """
+    STATE = ('phase', 'energy', 'locked', 'active')
+    
+    def __init__(self, width: int = 10, height: int = 8, seed: Optional[int] = None,
+                 cache: Optional[AssetCache] = None):
         self.width = width
         self.height = height
+        self.seed = seed
+        self.cache = cache if seed is not None else None
         self.cell_size = 80
         self.grid_offset = [50, 100]
-        self.cells: List[Dict] = []
         self.initialize_grid()
-        self.active_cells: Set[Tuple[int, int]] = set()
+        self.active_cells = ActiveCellView(self)
         self.pulse_phase = 0.0
         self.pulse_speed = 0.05
         self.grid_alpha = GRID_ALPHA
         self.unlocked_cells = 1
+        self.grid_surface: Optional[pygame.Surface] = None
+        self.connection_surface: Optional[pygame.Surface] = None
+        self.connection_key: Optional[Tuple[frozenset, frozenset]] = None
         
+    def generate_cells(self) -> np.ndarray:
+        """Random per-cell state as rows of (r, g, b, a, energy, phase)."""
+        rng = random.Random(self.seed) if self.seed is not None else random
+        return np.array([
+            (*rng.choice(GRID_COLORS), rng.uniform(0.5, 1.5), rng.uniform(0, 2 * math.pi))
+            for _ in range(self.width * self.height)
+        ], dtype=np.float64)
+    
     def initialize_grid(self) -> None:
-        for x in range(self.width):
-            for y in range(self.height):
-                cell = {
-                    'x': x,
-                    'y': y,
-                    'color': random.choice(GRID_COLORS),
-                    'energy': random.uniform(0.5, 1.5),
-                    'phase': random.uniform(0, 2 * math.pi),
-                    'locked': True,
-                    'activation_time': 0
-                }
-                self.cells.append(cell)
+        if self.cache is None:
+            state = self.generate_cells()
+        else:
+            state = self.cache.load_or_build(
+                "grid", (f"{self.width}x{self.height}", self.seed), self.generate_cells)
+        
+        count = self.width * self.height
+        index = np.arange(count)
+        self.cell_x = index // self.height
+        self.cell_y = index % self.height
+        self.color = np.array(state[:, :4], dtype=np.int32)
+        self.energy = np.array(state[:, 4])
+        self.phase = np.array(state[:, 5])
+        self.locked = np.ones(count, dtype=bool)
+        self.active = np.zeros(count, dtype=bool)
         
         center_x, center_y = self.width // 2, self.height // 2
-        self.cells[center_y * self.width + center_x]['locked'] = False
+        self.locked[center_x * self.height + center_y] = False
     
-    def update(self, current_element: Dict, time: int) -> None:
+    def update(self, current_element: ElementRecord, time: float) -> None:
         self.pulse_phase = (self.pulse_phase + self.pulse_speed) % (2 * math.pi)
-        atomic_number = current_element.get('atomic_number', 1)
-        cells_to_unlock = min(len(self.cells), atomic_number + 2)
-        self.unlocked_cells = min(cells_to_unlock, len(self.cells))
+        atomic_number = current_element.atomic_number
+        self.unlocked_cells = min(len(self.locked), atomic_number + 2)
         
-        for i, cell in enumerate(self.cells):
-            cell['locked'] = i >= self.unlocked_cells
-            
-            if not cell['locked']:
-                electronegativity = current_element.get('electronegativity', 1.0) or 1.0
-                cell['phase'] += 0.01 * electronegativity
-                cell['energy'] = 0.8 + 0.5 * math.sin(time * 0.001 + cell['phase'])
-                
-                if (cell['x'] + cell['y'] + int(time * 0.01)) % atomic_number == 0:
-                    self.active_cells.add((cell['x'], cell['y']))
-                elif (cell['x'], cell['y']) in self.active_cells:
-                    self.active_cells.remove((cell['x'], cell['y']))
+        unlocked = slice(0, self.unlocked_cells)
+        self.locked[:] = True
+        self.locked[unlocked] = False
+        
+        phase = self.phase[unlocked]
+        phase += 0.01 * current_element.electronegativity
+        self.energy[unlocked] = 0.8 + 0.5 * np.sin(time * 0.001 + phase)
+        self.active[unlocked] = (
+            (self.cell_x[unlocked] + self.cell_y[unlocked] + int(time * 0.01)) % atomic_number == 0
+        )
     
-    def draw(self, surface: pygame.Surface) -> None:
-        grid_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    def bind(self, arrays: Dict[str, np.ndarray], pulse_phase: float, unlocked_cells: int) -> None:
+        """Draw from externally owned ``STATE`` arrays, e.g. a shared snapshot."""
+        for name in self.STATE:
+            setattr(self, name, arrays[name])
+        self.pulse_phase = pulse_phase
+        self.unlocked_cells = unlocked_cells
+    
+    def cell_edges(self, cell_x: np.ndarray, cell_y: np.ndarray,
+                   scale: Tuple[float, float] = (1.0, 1.0)) -> Tuple[np.ndarray, ...]:
+        """Screen ``(left, top, right, bottom)`` of cells laid out at ``scale``."""
+        sx, sy = scale
+        offset_x, offset_y = self.grid_offset
+        size = self.cell_size
+        return (np.rint((offset_x + cell_x * size) * sx).astype(np.int32),
+                np.rint((offset_y + cell_y * size) * sy).astype(np.int32),
+                np.rint((offset_x + (cell_x + 1) * size) * sx).astype(np.int32),
+                np.rint((offset_y + (cell_y + 1) * size) * sy).astype(np.int32))
+    
+    def dirty_boxes(self, scale: Tuple[float, float] = (1.0, 1.0)) -> Optional[np.ndarray]:
+        """Screen boxes ``(left, top, right, bottom)`` that change on the next draw.
+
+        Every unlocked cell pulses each frame, so each one contributes boxes.
+        Connection lines only change with the active set, so their span is
+        marked, old and new, only on the frames where that happens.
+        """
+        if self.grid_alpha == 0:
+            return None
+        cells = np.flatnonzero(~self.locked)
+        left, top, right, bottom = self.cell_edges(self.cell_x[cells], self.cell_y[cells], scale)
+        # Idle cells are a one-pixel outline with rounded corners; active ones are filled.
+        corner = 6
+        active = self.active[cells]
+        boxes = [
+            np.column_stack((left, top, right, top + corner)),
+            np.column_stack((left, bottom - corner, right, bottom)),
+            np.column_stack((left, top, left + 1, bottom)),
+            np.column_stack((right - 1, top, right, bottom)),
+            np.column_stack((left, top, right, bottom))[active],
+        ]
+        linked = frozenset(self.active_cells)
+        drawn = self.connection_key[0] if self.connection_key is not None else frozenset()
+        for span in (linked, drawn) if linked != drawn else ():
+            if len(span) > 1:
+                xs, ys = zip(*span)
+                span_left, span_top, _, _ = self.cell_edges(min(xs), min(ys), scale)
+                _, _, span_right, span_bottom = self.cell_edges(max(xs), max(ys), scale)
+                boxes.append(np.array([[span_left, span_top, span_right, span_bottom]]))
+        return np.concatenate(boxes)
+    
+    def draw_connections(self, colors: Dict[Tuple[int, int], Tuple[int, int, int]],
+                         scale: Tuple[float, float] = (1.0, 1.0)) -> pygame.Surface:
+        """Lines between active cells, re-rendered only when the active set changes.
+
+        Each unique pair is drawn once, in the colour of an unlocked endpoint.
+        """
+        key = (frozenset(self.active_cells), frozenset(colors), scale)
+        if self.connection_surface is None:
+            self.connection_surface = pygame.Surface(self.grid_surface.get_size(), pygame.SRCALPHA)
+        elif key == self.connection_key:
+            return self.connection_surface
+        self.connection_key = key
         
-        for cell in self.cells:
-            if cell['locked']:
+        layer = self.connection_surface
+        layer.fill((0, 0, 0, 0))
+        cells = sorted(self.active_cells)
+        left, top, right, bottom = self.cell_edges(*np.array(cells).T, scale)
+        centers = dict(zip(cells, zip(((left + right) // 2).tolist(), ((top + bottom) // 2).tolist())))
+        for a, b in combinations(cells, 2):
+            color = colors.get(a) or colors.get(b)
+            if color is None:
                 continue
-                
-            x = self.grid_offset[0] + cell['x'] * self.cell_size
-            y = self.grid_offset[1] + cell['y'] * self.cell_size
-            
-            pulse = 0.8 + 0.2 * math.sin(self.pulse_phase + cell['phase'])
-            r, g, b, a = cell['color']
-            color = (
-                min(255, int(r * pulse * cell['energy'])),
-                min(255, int(g * pulse * cell['energy'])),
-                min(255, int(b * pulse * cell['energy'])),
-                a
-            )
+            pygame.draw.line(layer, (*color, 80), centers[a], centers[b], 2)
+        return layer
+    
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0,
+             scale: Tuple[float, float] = (1.0, 1.0)) -> None:
+        """Draw the unlocked cells, with the layout scaled by ``scale`` per axis."""
+        if self.grid_surface is None or self.grid_surface.get_size() != surface.get_size():
+            self.grid_surface = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+            self.connection_surface = None
+        grid_surface = self.grid_surface
+        grid_surface.fill((0, 0, 0, 0))
+        highlight_colors: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+        symbols: List[Tuple[int, int]] = []
+        
+        cells = np.flatnonzero(~self.locked)
+        pulse_phase = self.pulse_phase - self.pulse_speed * (1.0 - alpha)
+        pulse = 0.8 + 0.2 * np.sin(pulse_phase + self.phase[cells])
+        shade = (self.color[cells, :3] * (pulse * self.energy[cells])[:, None]).astype(np.int32)
+        np.minimum(shade, 255, out=shade)
+        edges = zip(*(edge.tolist() for edge in self.cell_edges(self.cell_x[cells], self.cell_y[cells], scale)))
+        
+        for i, (r, g, b), a, (x, y, right, bottom) in zip(cells.tolist(), shade.tolist(),
+                                                          self.color[cells, 3].tolist(), edges):
+            cell_x, cell_y = divmod(i, self.height)
+            color = (r, g, b, a)
             
-            cell_rect = pygame.Rect(x, y, self.cell_size, self.cell_size)
+            cell_rect = pygame.Rect(x, y, right - x, bottom - y)
             pygame.draw.rect(grid_surface, color, cell_rect, 1, border_radius=5)
             
-            if (cell['x'], cell['y']) in self.active_cells:
+            if self.active[i]:
                 highlight_color = (
                     min(255, color[0] + 100),
                     min(255, color[1] + 100),
@@ -260,271 +1166,642 @@ class QuantumGrid:
                 )
                 pygame.draw.rect(grid_surface, highlight_color, 
                                 cell_rect.inflate(-5, -5), 0, border_radius=3)
-                
-                for other_x, other_y in self.active_cells:
-                    if (other_x, other_y) != (cell['x'], cell['y']):
-                        ox = self.grid_offset[0] + other_x * self.cell_size + self.cell_size // 2
-                        oy = self.grid_offset[1] + other_y * self.cell_size + self.cell_size // 2
-                        cx = x + self.cell_size // 2
-                        cy = y + self.cell_size // 2
-                        
-                        line_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                        pygame.draw.line(line_surface, (*highlight_color[:3], 80), (cx, cy), (ox, oy), 2)
-                        grid_surface.blit(line_surface, (0, 0))
-            
-            if (cell['x'], cell['y']) in self.active_cells:
-                symbol = grid_font.render("Q", True, (255, 255, 255, 200))
-                grid_surface.blit(symbol, (x + self.cell_size//2 - symbol.get_width()//2, 
-                                    y + self.cell_size//2 - symbol.get_height()//2))
+                highlight_colors[(cell_x, cell_y)] = highlight_color[:3]
+                symbols.append(cell_rect.center)
+        
+        if len(self.active_cells) > 1 and highlight_colors:
+            grid_surface.blit(self.draw_connections(highlight_colors, scale), (0, 0))
+        else:
+            self.connection_key = None
+        
+        symbol = hud_cache.text(app.fonts.grid, "Q", (255, 255, 255, 200))
+        if scale != (1.0, 1.0):
+            symbol = hud_cache.get(('grid symbol', scale),
+                                   lambda: pygame.transform.smoothscale_by(symbol, min(scale)))
+        for x, y in symbols:
+            grid_surface.blit(symbol, (x - symbol.get_width()//2, 
+                                y - symbol.get_height()//2))
         
         grid_surface.set_alpha(self.grid_alpha)
         surface.blit(grid_surface, (0, 0))
 
 # ======================
 # Transition Effects
+TRANSITION_FRAME_STEPS = 64
+
 class TransitionEffects:
-    def __init__(self):
+    """Wavefront wipe played on element changes.
+
+    The wavefront is a row of 3 px stripes whose extents depend only on
+    progress, so each quantized progress step is computed once, with NumPy,
+    into a cached blit sequence of one shared stripe surface. Playing a
+    transition is then a single ``blits`` call per frame at the current alpha.
+    """
+    def __init__(self, steps: int = TRANSITION_FRAME_STEPS):
         self.transition_time = 0
         self.max_transition_time = MAX_TRANSITION_TIME
         self.transition_active = False
         self.transition_type = "quantum"
-        self.transition_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         self.transition_color = (150, 100, 255)
+        self.steps = steps
+        self.frames: Dict[int, List[Tuple[pygame.Surface, Tuple[int, int], Tuple[int, int, int, int]]]] = {}
+        self.frame_size: Optional[Tuple[int, int]] = None
+        self.stripe: Optional[pygame.Surface] = None
         
     def start_transition(self) -> None:
         self.transition_time = 0
         self.transition_active = True
         
-    def update(self, dt: int) -> None:
+    def update(self, dt: float) -> None:
         if self.transition_active:
             self.transition_time += dt
             if self.transition_time >= self.max_transition_time:
                 self.transition_active = False
+    
+    def wavefront(self, progress: float, width: int, height: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Column x positions with the first and last row of each 3 px wave stripe."""
+        xs = np.arange(0, width, 5)
+        offset = np.sin(xs / 50 + progress * 10) * 20
+        if progress < 0.5:
+            wave_height = int(height * progress * 2)
+            top = np.floor(height - wave_height + offset).astype(np.int32)
+            bottom = np.full(xs.shape, height - 1, dtype=np.int32)
+        else:
+            wave_height = int(height * (1 - progress) * 2)
+            top = np.zeros(xs.shape, dtype=np.int32)
+            bottom = np.floor(wave_height + offset).astype(np.int32)
+        return xs, np.clip(top, 0, None), np.clip(bottom, 0, height - 1)
+    
+    def frame(self, step: int, size: Tuple[int, int]) -> List[Tuple[pygame.Surface, Tuple[int, int], Tuple[int, int, int, int]]]:
+        """Blit sequence drawing the wavefront at progress ``step / steps``."""
+        if size != self.frame_size:
+            self.frame_size = size
+            self.frames.clear()
+            self.stripe = pygame.Surface((3, size[1]))
+            if pygame.display.get_surface() is not None:
+                self.stripe = self.stripe.convert()
+            self.stripe.fill(self.transition_color[:3])
+        frame = self.frames.get(step)
+        if frame is None:
+            xs, top, bottom = self.wavefront(step / self.steps, *size)
+            frame = [(self.stripe, (x - 1, y0), (0, 0, 3, y1 - y0 + 1))
+                     for x, y0, y1 in zip(xs.tolist(), top.tolist(), bottom.tolist()) if y0 <= y1]
+            self.frames[step] = frame
+        return frame
                 
     def draw(self, surface: pygame.Surface) -> None:
         if not self.transition_active:
             return
             
         progress = self.transition_time / self.max_transition_time
-        self.transition_surface.fill((0, 0, 0, 0))
-        
         if progress < 0.5:
             alpha = int(255 * progress * 2)
-            wave_height = int(SCREEN_HEIGHT * progress * 2)
-            
-            for x in range(0, SCREEN_WIDTH, 5):
-                offset = math.sin(x / 50 + progress * 10) * 20
-                pygame.draw.line(
-                    self.transition_surface, 
-                    (*self.transition_color[:3], alpha),
-                    (x, SCREEN_HEIGHT - wave_height + offset),
-                    (x, SCREEN_HEIGHT),
-                    3
-                )
         else:
             alpha = int(255 * (1 - progress) * 2)
-            wave_height = int(SCREEN_HEIGHT * (1 - progress) * 2)
-            
-            for x in range(0, SCREEN_WIDTH, 5):
-                offset = math.sin(x / 50 + progress * 10) * 20
-                pygame.draw.line(
-                    self.transition_surface, 
-                    (*self.transition_color[:3], alpha),
-                    (x, 0),
-                    (x, wave_height + offset),
-                    3
-                )
         
-        surface.blit(self.transition_surface, (0, 0))
+        frame = self.frame(min(self.steps - 1, int(progress * self.steps)), surface.get_size())
+        self.stripe.set_alpha(alpha)
+        surface.blits(frame, doreturn=False)
+
+# ======================
+# Particle System
+PARTICLE_CAPACITY = 32768
+PARTICLES_PER_EMIT = 3
+PARTICLE_EMIT_INTERVAL = 50  # ms
+PARTICLE_ALPHA_BUCKETS = 16
+
+class ParticlePool:
+    """Fixed-capacity structure-of-arrays particle store.
+
+    Live particles occupy indices ``[0, count)``; dead ones are retired by
+    mask compaction at the end of each update, so no per-particle objects
+    are ever allocated or removed from a list. ``previous`` holds each
+    particle's position before the last update for render interpolation.
+    """
+    COLUMNS = ('position', 'previous', 'velocity', 'size', 'life',
+               'quantum_phase', 'quantum_freq', 'color')
+
+    def __init__(self, capacity: int = PARTICLE_CAPACITY, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.previous = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.quantum_phase = np.zeros(capacity, dtype=np.float32)
+        self.quantum_freq = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self._columns = tuple(getattr(self, name) for name in self.COLUMNS)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def bind(self, arrays: Dict[str, np.ndarray], count: int) -> None:
+        """Use externally owned column arrays, e.g. a shared snapshot."""
+        for name in self.COLUMNS:
+            setattr(self, name, arrays[name])
+        self._columns = tuple(getattr(self, name) for name in self.COLUMNS)
+        self.count = count
+
+    def spawn(self, x: np.ndarray, y: np.ndarray, color: Tuple[int, int, int]) -> int:
+        """Append particles at the given positions; returns how many fit."""
+        n = min(len(x), self.capacity - self.count)
+        if n <= 0:
+            return 0
+        s = slice(self.count, self.count + n)
+        rng = self.rng
+        self.position[s, 0] = x[:n]
+        self.position[s, 1] = y[:n]
+        self.previous[s] = self.position[s]
+        self.velocity[s] = rng.uniform(-2, 2, (n, 2))
+        self.size[s] = rng.integers(2, 9, n)
+        self.life[s] = rng.integers(50, 151, n)
+        self.quantum_phase[s] = rng.uniform(0, 2 * math.pi, n)
+        self.quantum_freq[s] = rng.uniform(0.01, 0.05, n)
+        self.color[s] = color
+        self.count += n
+        return n
+
+    def update(self) -> None:
+        n = self.count
+        if n == 0:
+            return
+        self.previous[:n] = self.position[:n]
+        phase = self.quantum_phase[:n]
+        phase += self.quantum_freq[:n]
+        quantum_effect = np.sin(phase) * 0.5 + 0.5
+        self.position[:n] += self.velocity[:n] * (0.5 + quantum_effect)[:, None]
+
+        decaying = np.flatnonzero(self.rng.random(n) < 0.1)
+        self.life[decaying] -= self.rng.integers(1, 4, decaying.size, dtype=np.int32)
+
+        size = self.size[:n]
+        size += np.sin(phase * 2) * 0.3
+        np.maximum(size, 1, out=size)
+
+        self.compact()
+
+    def compact(self) -> None:
+        n = self.count
+        alive = self.life[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        for column in self._columns:
+            column[:live] = column[:n][alive]
+        self.count = live
+
+    def dirty_boxes(self, scale: Tuple[float, float] = (1.0, 1.0)) -> Optional[np.ndarray]:
+        """Per-particle ``(left, top, right, bottom)`` boxes covering the glow
+        sprite anywhere between ``previous`` and ``position``."""
+        n = self.count
+        if n == 0:
+            return None
+        reach = (self.size[:n] * (2 * min(scale)) + 1)[:, None]
+        low = np.minimum(self.previous[:n], self.position[:n]) * scale - reach
+        high = np.maximum(self.previous[:n], self.position[:n]) * scale + reach
+        return np.hstack((np.floor(low), np.ceil(high))).astype(np.int32)
+
+    def draw(self, surface: pygame.Surface, sprites: 'GlowSpriteCache', alpha: float = 1.0,
+             scale: Tuple[float, float] = (1.0, 1.0)) -> None:
+        """Blit every live particle in a single ``Surface.blits`` call.
+
+        Positions are interpolated ``alpha`` of the way from ``previous``;
+        positions and sprite sizes are then scaled by ``scale``.
+        """
+        n = self.count
+        if n == 0:
+            return
+        size = self.size[:n]
+        if scale != (1.0, 1.0):
+            size = np.maximum(size * min(scale), 1)
+        size = size.astype(np.int64)
+        fade = np.minimum(255, self.life[:n] * 2)
+        bucket = (fade * (sprites.alpha_buckets - 1) + 127) // 255
+        rgb = self.color[:n].astype(np.int64)
+        packed = (rgb[:, 0] << 32) | (rgb[:, 1] << 24) | (rgb[:, 2] << 16) | (size << 8) | bucket
+        keys, inverse = np.unique(packed, return_inverse=True)
+        atlas = [
+            sprites.get(int(k >> 8) & 0xFF,
+                        (int(k >> 32) & 0xFF, int(k >> 24) & 0xFF, int(k >> 16) & 0xFF),
+                        int(k) & 0xFF)
+            for k in keys
+        ]
+        position = self.position[:n]
+        if alpha < 1.0:
+            previous = self.previous[:n]
+            position = previous + (position - previous) * alpha
+        if scale != (1.0, 1.0):
+            position = position * scale
+        top_left = position.astype(np.int32) - (size * 2)[:, None]
+        surface.blits([(atlas[i], pos) for i, pos in zip(inverse.tolist(), top_left.tolist())],
+                      doreturn=False)
+
+class GlowSpriteCache:
+    """Pre-rendered particle glow sprites keyed on (size, color, alpha bucket)."""
+    def __init__(self, alpha_buckets: int = PARTICLE_ALPHA_BUCKETS, max_sprites: int = 4096):
+        self.alpha_buckets = alpha_buckets
+        self.max_sprites = max_sprites
+        self.sprites: Dict[Tuple[int, Tuple[int, int, int], int], pygame.Surface] = {}
+
+    def get(self, size: int, color: Tuple[int, int, int], alpha_bucket: int) -> pygame.Surface:
+        key = (size, color, alpha_bucket)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            if len(self.sprites) >= self.max_sprites:
+                self.sprites.clear()
+            alpha = alpha_bucket * 255 // (self.alpha_buckets - 1)
+            sprite = pygame.Surface((size*4, size*4), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha//3),
+                             (size*2, size*2), size*2)
+            pygame.draw.circle(sprite, (*color, alpha),
+                             (size*2, size*2), size)
+            self.sprites[key] = sprite
+        return sprite
+
+def emit_particles(particles: ParticlePool, center: Tuple[int, int], color: Tuple[int, int, int]) -> None:
+    angle = particles.rng.uniform(0, 2 * math.pi, PARTICLES_PER_EMIT)
+    radius = particles.rng.integers(30, 101, PARTICLES_PER_EMIT)
+    particles.spawn(center[0] + np.cos(angle) * radius,
+                    center[1] + np.sin(angle) * radius,
+                    color)
+
+def emitter_center() -> Tuple[int, int]:
+    width, height = app.game_state.view_size
+    return (width // 2 + app.game_state.camera_offset[0],
+            height // 2 + app.game_state.camera_offset[1])
+
+def update_particles(current_time: Optional[float] = None) -> None:
+    particles = app.game_state.particles
+    if current_time is None:
+        current_time = pygame.time.get_ticks()
+    if current_time - app.game_state.last_particle_time > PARTICLE_EMIT_INTERVAL:
+        emit_particles(particles, emitter_center(), app.game_state.current_element.particle_color)
+        app.game_state.last_particle_time = current_time
+    
+    particles.update()
+
+# ======================
+# Dirty Rect Tracking
+class DirtyRectTracker:
+    """Dirty screen area for ``pygame.display.update(rects)``, kept as a tile mask.
+
+    Each frame the layers mark the areas they draw into, rounded out to
+    ``tile``-pixel tiles. A tile is dirty if it was marked this frame or the
+    previous one, so content that moved away is repainted too. Marks never
+    grow into bounding boxes, so scattered particles stay scattered tiles.
+    """
+    def __init__(self, size: Tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT),
+                 tile: int = DIRTY_TILE_SIZE, full_screen_ratio: float = 0.6):
+        self.tile = tile
+        self.full_screen_ratio = full_screen_ratio
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.allocate()
+        self.background_time = -DIRTY_BACKGROUND_INTERVAL
+        self.background_position: Tuple[int, int] = (0, 0)
+        self.hud_key: Optional[Tuple] = None
+        self.status: Optional[str] = None
+        self.buffer: Optional[pygame.Surface] = None
+
+    def allocate(self) -> None:
+        shape = (-(-self.screen_rect.height // self.tile), -(-self.screen_rect.width // self.tile))
+        self.previous = np.zeros(shape, dtype=bool)
+        self.current = np.zeros(shape, dtype=bool)
+        self.full = True
+
+    def resize(self, size: Tuple[int, int]) -> None:
+        if size != self.screen_rect.size:
+            self.screen_rect = pygame.Rect((0, 0), size)
+            self.allocate()
+
+    def scratch(self, surface: pygame.Surface, area: pygame.Rect) -> pygame.Surface:
+        """An off-screen copy of ``surface`` holding its current pixels in ``area``."""
+        if self.buffer is None or self.buffer.get_size() != surface.get_size():
+            self.buffer = surface.copy()
+        else:
+            self.buffer.blit(surface, area, area)
+        return self.buffer
+
+    def mark(self, rect: Optional[pygame.Rect]) -> None:
+        if rect is not None:
+            self.mark_boxes(np.array([[rect.left, rect.top, rect.right, rect.bottom]]))
+
+    def mark_boxes(self, boxes: Optional[np.ndarray]) -> None:
+        """Mark an (n, 4) array of ``(left, top, right, bottom)`` pixel boxes."""
+        if boxes is None or len(boxes) == 0:
+            return
+        rows, cols = self.current.shape
+        boxes = np.asarray(boxes, dtype=np.int64)
+        visible = ((boxes[:, 2] > 0) & (boxes[:, 3] > 0) &
+                   (boxes[:, 0] < self.screen_rect.width) & (boxes[:, 1] < self.screen_rect.height) &
+                   (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1]))
+        boxes = boxes[visible]
+        if len(boxes) == 0:
+            return
+        first_col = np.clip(boxes[:, 0] // self.tile, 0, cols - 1)
+        first_row = np.clip(boxes[:, 1] // self.tile, 0, rows - 1)
+        end_col = np.clip((boxes[:, 2] - 1) // self.tile, 0, cols - 1) + 1
+        end_row = np.clip((boxes[:, 3] - 1) // self.tile, 0, rows - 1) + 1
+        # Rasterize every box at once: +1/-1 at the corners of each box in a
+        # difference array, whose 2D prefix sum is then each tile's box count.
+        stride = cols + 1
+        corners = np.concatenate((first_row * stride + first_col, first_row * stride + end_col,
+                                  end_row * stride + first_col, end_row * stride + end_col))
+        weights = np.repeat([1, -1, -1, 1], len(boxes))
+        counts = np.bincount(corners, weights, (rows + 1) * stride).reshape(rows + 1, stride)
+        self.current |= counts.cumsum(0).cumsum(1)[:rows, :cols] > 0.5
+
+    def mark_all(self) -> None:
+        self.full = True
+
+    def collect(self) -> List[pygame.Rect]:
+        """Turn this frame's and last frame's tiles into the rects to repaint.
+
+        Runs of dirty tiles along a row become one rect, and identical runs on
+        consecutive rows are stacked into taller rects.
+        """
+        dirty = self.previous | self.current
+        self.previous, self.current = self.current, self.previous
+        self.current[:] = False
+        
+        if self.full or dirty.mean() > self.full_screen_ratio:
+            self.full = False
+            return [self.screen_rect.copy()]
+        
+        tile = self.tile
+        padded = np.zeros((dirty.shape[0], dirty.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = dirty
+        edges = np.diff(padded, axis=1)
+        run_rows, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+        
+        rects: List[pygame.Rect] = []
+        above: Dict[Tuple[int, int], pygame.Rect] = {}
+        runs: Dict[Tuple[int, int], pygame.Rect] = {}
+        last_row = -2
+        for row, start, end in zip(run_rows.tolist(), starts.tolist(), ends.tolist()):
+            if row != last_row:
+                above, runs = (runs if row == last_row + 1 else {}), {}
+                last_row = row
+            rect = above.pop((start, end), None)
+            if rect is None:
+                rect = pygame.Rect(start * tile, row * tile, (end - start) * tile, 0)
+                rects.append(rect)
+            rect.height += tile
+            runs[(start, end)] = rect
+        return [rect.clip(self.screen_rect) for rect in rects]
+
+# ======================
+# Render Target
+class RenderTarget:
+    """Internal-resolution frame buffer, scaled once per frame to the window.
+
+    The internal size is either fixed (``resolution``) or the window size
+    times ``scale``. When it equals the window the scene is drawn straight
+    to the display and nothing is scaled. A window resize only changes the
+    internal size once the window has held still for ``settle`` ms; until
+    then the previous size is scaled to fit, so a drag-resize does not make
+    every subsystem reallocate its buffers on each intermediate size.
+    
+    The world keeps its window-pixel layout and is drawn at ``view_scale``;
+    the HUD is drawn on the window after scaling, so it stays sharp and in
+    place whatever the internal size, and mouse input needs no mapping.
+    """
+    def __init__(self, resolution: Optional[Tuple[int, int]] = RENDER_RESOLUTION,
+                 scale: float = RENDER_SCALE, smooth: bool = RENDER_SMOOTH_SCALE,
+                 settle: int = RENDER_RESIZE_SETTLE):
+        self.resolution = resolution
+        self.scale = scale
+        self.smooth = smooth
+        self.settle = settle
+        self.size: Optional[Tuple[int, int]] = None
+        self.window_size: Optional[Tuple[int, int]] = None
+        self.window_changed = 0
+        self.surface: Optional[pygame.Surface] = None
+
+    def internal_size(self, window_size: Tuple[int, int]) -> Tuple[int, int]:
+        if self.resolution is not None:
+            return self.resolution
+        return (max(1, round(window_size[0] * self.scale)), max(1, round(window_size[1] * self.scale)))
+
+    def begin(self, window: pygame.Surface, current_time: int) -> pygame.Surface:
+        """The surface to draw this frame on: the window itself or the internal buffer."""
+        window_size = window.get_size()
+        if window_size != self.window_size:
+            self.window_size = window_size
+            self.window_changed = current_time
+        wanted = self.internal_size(window_size)
+        if self.size is None or (wanted != self.size and current_time - self.window_changed >= self.settle):
+            self.size = wanted
+        
+        if self.size == window_size:
+            self.surface = None
+            return window
+        if self.surface is None or self.surface.get_size() != self.size:
+            self.surface = pygame.Surface(self.size).convert(window)
+        return self.surface
+
+    def present(self, window: pygame.Surface,
+                dirty_rects: Optional[List[pygame.Rect]]) -> Optional[List[pygame.Rect]]:
+        """Scale the internal buffer onto the window; returns the rects to update (None for all)."""
+        if self.surface is None:
+            return dirty_rects
+        if self.smooth and window.get_bitsize() >= 24:
+            pygame.transform.smoothscale(self.surface, window.get_size(), window)
+        else:
+            pygame.transform.scale(self.surface, window.get_size(), window)
+        return None
+
+    def view_scale(self) -> Tuple[float, float]:
+        """Internal pixels per window pixel on each axis."""
+        if self.surface is None:
+            return (1.0, 1.0)
+        return (self.size[0] / self.window_size[0], self.size[1] / self.window_size[1])
 
 # ======================
 # Game State
 class GameState:
-    def __init__(self):
-        self.selected_element_key = next(
-            key for key, elem in periodic_table.items()
-            if elem['atomic_number'] == 1
-        )
-        self.current_element = periodic_table[self.selected_element_key]
+    def __init__(self, seed: Optional[int] = None):
+        self.selected_element_key = app.element_index.key_by_number[1]
+        self.current_element = app.element_index[1]
         self.animation_time = 0
         self.electron_positions: List[Tuple[float, float, int]] = []
         self.show_info = True
         self.show_orbitals = True
         self.show_electrons = True
         self.zoom = 1.0
-        self.particles: List['Particle'] = []
+        self.particles = ParticlePool(seed=seed)
+        self.glow_sprites = GlowSpriteCache()
+        self.orbital_sprites = OrbitalSpriteCache()
         self.last_particle_time = 0
         self.camera_offset = [0, 0]
+        self.view_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
         self.dragging = False
         self.last_mouse_pos = (0, 0)
-        self.background = DynamicBackground()
-        self.quantum_grid = QuantumGrid()
+        self.asset_cache = AssetCache()
+        self.background = DynamicBackground(seed=ASSET_SEED, lazy=True, cache=self.asset_cache)
+        self.quantum_grid = QuantumGrid(seed=ASSET_SEED, cache=self.asset_cache)
         self.transition = TransitionEffects()
         self.element_progression = 0
-        self.max_progression = max(e['atomic_number'] for e in periodic_table.values())
-
-game_state = GameState()
-
-# ======================
-# Particle System
-class Particle:
-    def __init__(self, x: float, y: float, element: Dict):
-        self.x = x
-        self.y = y
-        self.size = random.randint(2, 8)
-        self.color = AGAPE_COLORS['Lithium']
-        self.life = random.randint(50, 150)
-        self.velocity = [random.uniform(-2, 2), random.uniform(-2, 2)]
-        self.quantum_phase = random.uniform(0, 2 * math.pi)
-        self.quantum_freq = random.uniform(0.01, 0.05)
-        self.element = element
-        
-        if 'electronegativity' in element:
-            en = element['electronegativity'] or 1.0
-            self.color = (
-                min(255, int(en * 80)),
-                min(255, 50 + int((element['atomic_number'] % 10) * 20)),
-                min(255, 100 + int((element['atomic_mass'] or 1) % 100))
-            )
-    
-    def update(self) -> None:
-        self.quantum_phase += self.quantum_freq
-        quantum_effect = math.sin(self.quantum_phase) * 0.5 + 0.5
-        
-        self.x += self.velocity[0] * (0.5 + quantum_effect)
-        self.y += self.velocity[1] * (0.5 + quantum_effect)
-        
-        if random.random() < 0.1:
-            self.life -= random.randint(1, 3)
-        
-        self.size = max(1, self.size + math.sin(self.quantum_phase * 2) * 0.3)
-    
-    def draw(self, surface: pygame.Surface) -> None:
-        alpha = min(255, self.life * 2)
-        color = (*self.color[:3], int(alpha))
-        
-        s = pygame.Surface((self.size*4, self.size*4), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*color[:3], alpha//3), 
-                         (self.size*2, self.size*2), self.size*2)
-        pygame.draw.circle(s, color, 
-                         (self.size*2, self.size*2), self.size)
-        surface.blit(s, (int(self.x)-self.size*2, int(self.y)-self.size*2))
-
-def update_particles() -> None:
-    current_time = pygame.time.get_ticks()
-    if current_time - game_state.last_particle_time > 50:
-        center_x = SCREEN_WIDTH // 2 + game_state.camera_offset[0]
-        center_y = SCREEN_HEIGHT // 2 + game_state.camera_offset[1]
-        
-        for _ in range(3):
-            angle = random.uniform(0, 2 * math.pi)
-            radius = random.randint(30, 100)
-            x = center_x + math.cos(angle) * radius
-            y = center_y + math.sin(angle) * radius
-            game_state.particles.append(Particle(x, y, game_state.current_element))
-        
-        game_state.last_particle_time = current_time
-    
-    for particle in game_state.particles[:]:
-        particle.update()
-        if particle.life <= 0:
-            game_state.particles.remove(particle)
+        self.max_progression = app.element_index.order[-1]
+        self.dirty_rendering = DIRTY_RECT_RENDERING
+        self.dirty_rects = DirtyRectTracker()
+        self.drone = False
+        self.offload: Optional['SimulationOffload'] = None
 
 # ======================
 # Drawing Functions
-def calculate_electron_positions(atomic_number: int, time: int) -> List[Tuple[float, float, int]]:
-    positions = []
-    shell_config = [2, 8, 8, 18, 18, 32]
+ELECTRON_SHELLS = (2, 8, 8, 18, 18, 32)
+
+@lru_cache(maxsize=1024)
+def electron_shell_layout(atomic_number: int, active_cells: int,
+                          total_cells: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Shell index and resting angle of each electron, filled shell by shell.
+
+    Shell capacities grow with the fraction of active grid cells, so the
+    layout is memoized on that fraction as well as the atomic number.
+    """
+    grid_factor = active_cells / total_cells
+    shells, angles = [], []
     remaining_electrons = atomic_number
-    
-    grid_factor = len(game_state.quantum_grid.active_cells) / (game_state.quantum_grid.width * game_state.quantum_grid.height)
-    shell_config = [max(1, int(s * (1 + grid_factor * 0.5))) for s in shell_config]
-    
-    for shell, max_electrons in enumerate(shell_config, 1):
+    for shell, capacity in enumerate(ELECTRON_SHELLS):
         if remaining_electrons <= 0:
             break
-        electrons_in_shell = min(max_electrons, remaining_electrons)
+        electrons_in_shell = min(max(1, int(capacity * (1 + grid_factor * 0.5))), remaining_electrons)
         remaining_electrons -= electrons_in_shell
-        radius = 30 + shell * 25
-        quantum_fluctuation = math.sin(time * 0.001 + shell) * 5 * grid_factor
-        
-        angle_step = (2 * math.pi) / max(1, electrons_in_shell)
-        for i in range(electrons_in_shell):
-            angle = angle_step * i + (time * 0.0005 * shell)
-            x = math.cos(angle) * (radius + quantum_fluctuation)
-            y = math.sin(angle) * (radius + quantum_fluctuation)
-            positions.append((x, y, shell-1))
-    return positions
-
-def draw_element_visual(screen: pygame.Surface, element: Dict, center_x: int, center_y: int, time: int) -> None:
-    atomic_number = element.get('atomic_number', 1)
-    electronegativity = element.get('electronegativity', 1.0) or 1.0
-    atomic_mass = element.get('atomic_mass', 1.0) or 1.0
-    nucleus_radius = 10 + min(20, math.log(atomic_mass) * 2)
-    red = int(min(255, electronegativity * 60))
-    blue = 255 - red
-    nucleus_color = (red, 50, blue)
-    
-    if game_state.show_orbitals:
-        shell_config = [2, 8, 8, 18, 18, 32]
-        for shell in range(1, len(shell_config)+1):
-            radius = 30 + shell * 25
-            s = pygame.Surface((radius*4, radius*4), pygame.SRCALPHA)
-            glow_radius = radius + math.sin(time * 0.001 + shell) * 5
-            pygame.draw.circle(s, (red, 50, blue, 30), 
-                             (radius*2, radius*2), glow_radius, 3)
-            pygame.draw.circle(s, (red, 50, blue, 80), 
-                             (radius*2, radius*2), radius, 1)
-            screen.blit(s, (center_x - radius*2, center_y - radius*2))
+        shells.append(np.full(electrons_in_shell, shell))
+        angles.append(np.arange(electrons_in_shell) * (2 * math.pi / electrons_in_shell))
+    shell, angle = np.concatenate(shells), np.concatenate(angles)
+    shell.flags.writeable = angle.flags.writeable = False
+    return shell, angle
+
+def calculate_electron_positions(atomic_number: int, time: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Electron offsets from the nucleus as ``(x, y, shell)`` arrays."""
+    grid = app.game_state.quantum_grid
+    active_cells, total_cells = len(grid.active_cells), grid.width * grid.height
+    shell, base_angle = electron_shell_layout(atomic_number, active_cells, total_cells)
+    
+    grid_factor = active_cells / total_cells
+    shell_number = shell + 1
+    radius = 30 + shell_number * 25 + np.sin(time * 0.001 + shell_number) * 5 * grid_factor
+    angle = base_angle + time * 0.0005 * shell_number
+    return np.cos(angle) * radius, np.sin(angle) * radius, shell
+
+def orbital_radius(shell: int) -> int:
+    return 30 + shell * 25
+
+class OrbitalSpriteCache:
+    """Orbital ring sprites keyed on (ring radius, glow radius, color), plus a reusable wave surface.
+
+    pygame truncates circle radii to whole pixels, so each ring has at most
+    eleven glow variants. The cache only ever holds one nucleus colour and
+    is refilled when the element changes.
+    """
+    def __init__(self):
+        self.color: Optional[Tuple[int, int, int]] = None
+        self.sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+        self.wave: Optional[pygame.Surface] = None
+    
+    def get(self, radius: int, glow_radius: int, color: Tuple[int, int, int]) -> pygame.Surface:
+        if color != self.color:
+            self.color = color
+            self.sprites.clear()
+        key = (radius, glow_radius)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            half = max(radius, glow_radius) + 2
+            sprite = pygame.Surface((half*2 + 1, half*2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, 30), (half, half), glow_radius, 3)
+            pygame.draw.circle(sprite, (*color, 80), (half, half), radius, 1)
+            self.sprites[key] = sprite
+        return sprite
+    
+    def wave_surface(self, size: int) -> pygame.Surface:
+        """A cleared ``size`` x ``size`` surface, reallocated only when the size changes."""
+        if self.wave is None or self.wave.get_width() != size:
+            self.wave = pygame.Surface((size, size), pygame.SRCALPHA)
+        else:
+            self.wave.fill((0, 0, 0, 0))
+        return self.wave
+
+def draw_element_visual(screen: pygame.Surface, element: ElementRecord, center_x: int, center_y: int,
+                        time: float, scale: float = 1.0) -> None:
+    atomic_number = element.atomic_number
+    nucleus_radius = element.nucleus_radius
+    nucleus_color = element.nucleus_color
+    
+    sprites = app.game_state.orbital_sprites
+    if app.game_state.show_orbitals:
+        rings = []
+        for shell in range(1, len(ELECTRON_SHELLS)+1):
+            glow_radius = int((orbital_radius(shell) + math.sin(time * 0.001 + shell) * 5) * scale)
+            ring = sprites.get(int(orbital_radius(shell) * scale), glow_radius, nucleus_color)
+            half = ring.get_width() // 2
+            rings.append((ring, (center_x - half, center_y - half)))
+        screen.blits(rings, doreturn=False)
     
     pulse = 0.8 + 0.2 * math.sin(time * 0.005)
     pygame.draw.circle(screen, nucleus_color, 
-                      (center_x, center_y), int(nucleus_radius * game_state.zoom * pulse))
+                      (center_x, center_y), int(nucleus_radius * app.game_state.zoom * pulse * scale))
     pygame.draw.circle(screen, AGAPE_COLORS['AGAPE'], 
-                      (center_x, center_y), 8 * pulse)
+                      (center_x, center_y), 8 * pulse * scale)
     
-    if len(game_state.quantum_grid.active_cells) > 3:
-        wave_surface = pygame.Surface((nucleus_radius*8, nucleus_radius*8), pygame.SRCALPHA)
+    if len(app.game_state.quantum_grid.active_cells) > 3:
+        wave_half = nucleus_radius * 4 * scale
+        wave_surface = sprites.wave_surface(int(wave_half * 2))
         for i in range(1, 4):
-            wave_radius = nucleus_radius * 2 * i + math.sin(time * 0.002 + i) * 10
+            wave_radius = (nucleus_radius * 2 * i + math.sin(time * 0.002 + i) * 10) * scale
             alpha = 100 - i * 20
             pygame.draw.circle(wave_surface, (*nucleus_color[:3], alpha), 
-                             (nucleus_radius*4, nucleus_radius*4), 
+                             (wave_half, wave_half), 
                              int(wave_radius), 2)
-        screen.blit(wave_surface, (center_x - nucleus_radius*4, center_y - nucleus_radius*4))
+        screen.blit(wave_surface, (center_x - wave_half, center_y - wave_half))
     
-    if game_state.show_electrons:
-        positions = calculate_electron_positions(atomic_number, time)
-        for x, y, shell in positions:
-            color_idx = shell % len(ELECTRON_COLORS)
-            color = ELECTRON_COLORS[color_idx]
-            
-            if (x, y) in [(p[0], p[1]) for p in positions[:atomic_number//2]]:
-                pulse = 0.7 + 0.3 * math.sin(time * 0.01 + shell)
-                size = 6 * pulse
-            else:
-                size = 4
-            
-            pygame.draw.circle(screen, color,
-                             (center_x + int(x * game_state.zoom),
-                             center_y + int(y * game_state.zoom)),
-                             int(size))
+    if app.game_state.show_electrons:
+        x, y, shell = calculate_electron_positions(atomic_number, time)
+        zoom = app.game_state.zoom * scale
+        screen_x = (center_x + (x * zoom).astype(np.int32)).tolist()
+        screen_y = (center_y + (y * zoom).astype(np.int32)).tolist()
+        
+        # The first half of the electrons (by fill order) pulse.
+        size = np.full(len(shell), 4, dtype=np.int32)
+        highlighted = slice(0, atomic_number // 2)
+        size[highlighted] = 6 * (0.7 + 0.3 * np.sin(time * 0.01 + shell[highlighted]))
+        if scale != 1.0:
+            size = np.maximum(size * scale, 1).astype(np.int32)
+        
+        for px, py, radius, electron_shell in zip(screen_x, screen_y, size.tolist(), shell.tolist()):
+            pygame.draw.circle(screen, ELECTRON_COLORS[electron_shell % len(ELECTRON_COLORS)],
+                             (px, py), radius)
+
+def element_visual_extent(element: ElementRecord, scale: float = 1.0) -> int:
+    """Half-width of the square around the nucleus that ``draw_element_visual`` can touch."""
+    outer = orbital_radius(len(ELECTRON_SHELLS))
+    extent = max(int(element.nucleus_radius * app.game_state.zoom), int(element.nucleus_radius * 4), 8)
+    if app.game_state.show_orbitals:
+        extent = max(extent, outer + 8)
+    if app.game_state.show_electrons:
+        extent = max(extent, int((outer + 5) * app.game_state.zoom) + 6)
+    return math.ceil(extent * scale) + 1
 
-def draw_element_info(screen: pygame.Surface, element: Dict, x: int, y: int) -> None:
-    if not game_state.show_info:
+def draw_element_info(screen: pygame.Surface, element: ElementRecord, x: int, y: int) -> None:
+    if not app.game_state.show_info:
         return
         
-    info_panel = pygame.Surface((300, 200), pygame.SRCALPHA)
-    info_panel.fill((20, 10, 40, 180))
-    pygame.draw.rect(info_panel, (100, 80, 150, 150), info_panel.get_rect(), 1)
-    screen.blit(info_panel, (x - 10, y - 10))
+    screen.blit(hud_cache.panel((300, 200)), (x - 10, y - 10))
     
-    symbol_text = element_font.render(element['symbol'], True, HIGHLIGHT)
-    name_text = title_font.render(element['name'], True, TEXT_COLOR)
-    number_text = info_font.render(f"Atomic Number: {element['atomic_number']}", True, TEXT_COLOR)
-    mass_text = info_font.render(f"Atomic Mass: {element.get('atomic_mass', 'N/A')}", True, TEXT_COLOR)
+    mass = 'N/A' if element.atomic_mass is None else element.atomic_mass
+    symbol_text = hud_cache.text(app.fonts.element, element.symbol, HIGHLIGHT)
+    name_text = hud_cache.text(app.fonts.title, element.name, TEXT_COLOR)
+    number_text = hud_cache.text(app.fonts.info, f"Atomic Number: {element.atomic_number}", TEXT_COLOR)
+    mass_text = hud_cache.text(app.fonts.info, f"Atomic Mass: {mass}", TEXT_COLOR)
     
-    progress = game_state.element_progression / game_state.max_progression
+    progress = app.game_state.element_progression / app.game_state.max_progression
     pygame.draw.rect(screen, (50, 50, 80), (x, y + 200, 300, 10))
     pygame.draw.rect(screen, (100, 150, 255), (x, y + 200, int(300 * progress), 10))
     
@@ -533,34 +1810,109 @@ def draw_element_info(screen: pygame.Surface, element: Dict, x: int, y: int) ->
     screen.blit(number_text, (x, y + 140))
     screen.blit(mass_text, (x, y + 170))
 
+CONTROLS = [
+    "Controls:",
+    "Space/Right - Next Element",
+    "Left - Previous Element",
+    "I - Toggle Info",
+    "O/E - Orbitals / Electrons",
+    "Mouse Wheel - Zoom",
+    "Mouse Drag - Move View",
+    "R - Reset View",
+    "G - Grid / D - Dirty Rects",
+    "M - Drone / P - Profiler / T - Trace"
+]
+
 def draw_controls(screen: pygame.Surface) -> None:
-    controls = [
-        "Controls:",
-        "Space/Right - Next Element",
-        "Left - Previous Element",
-        "I - Toggle Info",
-        "O - Toggle Orbitals",
-        "E - Toggle Electrons",
-        "Mouse Wheel - Zoom",
-        "Mouse Drag - Move View",
-        "R - Reset View",
-        "G - Toggle Quantum Grid"
-    ]
-    
-    control_panel = pygame.Surface((250, 25 + len(controls) * 25), pygame.SRCALPHA)
-    control_panel.fill((20, 10, 40, 180))
-    pygame.draw.rect(control_panel, (100, 80, 150, 150), control_panel.get_rect(), 1)
-    screen.blit(control_panel, (15, 15))
-    
-    for i, control in enumerate(controls):
-        color = HIGHLIGHT if i == 0 else TEXT_COLOR
-        text = small_font.render(control, True, color)
-        screen.blit(text, (20, 20 + i * 25))
+    def build() -> pygame.Surface:
+        control_panel = hud_cache.panel((250, 25 + len(CONTROLS) * 25)).copy()
+        for i, control in enumerate(CONTROLS):
+            color = HIGHLIGHT if i == 0 else TEXT_COLOR
+            control_panel.blit(hud_cache.text(app.fonts.small, control, color), (5, 5 + i * 25))
+        return control_panel
+    
+    screen.blit(hud_cache.get(('controls', tuple(CONTROLS)), build), (15, 15))
+
+def draw_hud(surface: pygame.Surface, status: str) -> None:
+    """Element info, controls and status line, laid out in window pixels."""
+    with profiler.stage('hud'):
+        draw_element_info(surface, app.game_state.current_element, 50, 300)
+        draw_controls(surface)
+        
+        status_text = hud_cache.text(app.fonts.small, status, TEXT_COLOR)
+        surface.blit(status_text, (surface.get_width() - 400, 20))
+
+def status_line() -> str:
+    return (
+        f"Element {app.game_state.current_element.atomic_number} of {len(app.element_index)} | "
+        f"Quantum Grid: {len(app.game_state.quantum_grid.active_cells)}/{app.game_state.quantum_grid.unlocked_cells} active"
+    )
+
+def draw_scene(surface: pygame.Surface, center_x: int, center_y: int, current_time: float,
+               status: str, background_position: Optional[Tuple[int, int]] = None,
+               alpha: float = 1.0, scale: Tuple[float, float] = (1.0, 1.0), hud: bool = True) -> None:
+    with profiler.stage('background'):
+        app.game_state.background.draw(surface, background_position, alpha)
+    with profiler.stage('grid'):
+        app.game_state.quantum_grid.draw(surface, alpha, scale)
+    with profiler.stage('particles'):
+        app.game_state.particles.draw(surface, app.game_state.glow_sprites, alpha, scale)
+    
+    with profiler.stage('atom'):
+        draw_element_visual(surface, app.game_state.current_element, center_x, center_y, current_time,
+                            min(scale))
+    if hud:
+        draw_hud(surface, status)
+    
+    with profiler.stage('transition'):
+        app.game_state.transition.draw(surface)
+    if hud:
+        profiler.draw_overlay(surface, current_time)
+
+def mark_dirty_layers(tracker: DirtyRectTracker, surface: pygame.Surface, center_x: int,
+                      center_y: int, current_time: float, status: str,
+                      scale: Tuple[float, float] = (1.0, 1.0), hud: bool = True) -> None:
+    """Record this frame's per-layer rects for dirty-rect rendering.
+
+    The scrolling background would dirty the whole screen every frame, so in
+    this mode it only advances every ``DIRTY_BACKGROUND_INTERVAL`` ms.
+    """
+    tracker.resize(surface.get_size())
+    if current_time - tracker.background_time >= DIRTY_BACKGROUND_INTERVAL:
+        tracker.background_time = current_time
+        tracker.background_position = app.game_state.background.scroll_position()
+        tracker.mark_all()
+    if app.game_state.transition.transition_active:
+        tracker.mark_all()
+    
+    tracker.mark_boxes(app.game_state.quantum_grid.dirty_boxes(scale))
+    tracker.mark_boxes(app.game_state.particles.dirty_boxes(scale))
+    extent = element_visual_extent(app.game_state.current_element, min(scale))
+    tracker.mark(pygame.Rect(center_x - extent, center_y - extent, extent * 2 + 1, extent * 2 + 1))
+    if not hud:
+        return
+    
+    panel_key = (app.game_state.current_element.atomic_number, app.game_state.show_info,
+                 app.game_state.show_orbitals, app.game_state.show_electrons, app.game_state.element_progression)
+    if panel_key != tracker.hud_key:
+        tracker.hud_key = panel_key
+        tracker.mark(pygame.Rect(15, 15, 250, 25 + len(CONTROLS) * 25))
+        tracker.mark(pygame.Rect(40, 290, 310, 220))
+    if status != tracker.status:
+        tracker.status = status
+        tracker.mark(pygame.Rect(surface.get_width() - 400, 20, 400, 24))
+    if profiler.show_overlay:
+        tracker.mark(profiler.overlay_rect(surface))
 
 # ======================
 # Sound Generation
-def generate_tone(frequency: float, duration: float = 0.5, volume: float = 0.3, 
-                 sample_rate: int = 44100, wave_type: str = 'sine') -> pygame.mixer.Sound:
+SOUND_BANK_MAX_BYTES = 16 * 1024 * 1024
+WAVETABLE_SIZE = 2048
+SYNTH_CHUNK_SAMPLES = 1024
+SYNTH_CROSSFADE = 0.25  # s
+
+def synthesize_tone(frequency: float, duration: float = 0.5, volume: float = 0.3, 
+                    sample_rate: int = 44100, wave_type: str = 'sine') -> np.ndarray:
     t = np.linspace(0, duration, int(sample_rate * duration), False)
     if wave_type == 'sine':
         tone = np.sin(frequency * t * 2 * np.pi)
@@ -581,138 +1933,712 @@ def generate_tone(frequency: float, duration: float = 0.5, volume: float = 0.3,
     
     tone = tone * envelope
     tone = (tone * (2**15 - 1) * volume).astype(np.int16)
-    stereo_tone = np.column_stack((tone, tone))
-    return pygame.sndarray.make_sound(stereo_tone)
+    return np.column_stack((tone, tone))
 
-def play_element_sound(element: Dict) -> None:
-    gyromagnetic = abs(element['nmr_data'].get('gyromagnetic_ratio') or 10)
-    base_freq = 220 + (element['atomic_number'] * 5)
-    frequency = base_freq * (1 + gyromagnetic / 100)
-    atomic_number = element['atomic_number']
-    wave_type = (
-        'sine' if atomic_number <= 2 else
-        'triangle' if atomic_number <= 10 else
-        'square' if atomic_number <= 18 else
-        'sawtooth'
-    )
-    duration = 0.3 + (0.7 * (1 - (atomic_number % 10) / 10))
-    tone = generate_tone(frequency, duration, 0.3, wave_type=wave_type)
-    tone.play()
+def generate_tone(frequency: float, duration: float = 0.5, volume: float = 0.3, 
+                 sample_rate: int = 44100, wave_type: str = 'sine') -> pygame.mixer.Sound:
+    return pygame.sndarray.make_sound(
+        synthesize_tone(frequency, duration, volume, sample_rate, wave_type))
+
+class SoundBank:
+    """Element tones synthesized once and kept in a memory-capped LRU cache.
+
+    Tones are keyed on their synthesis parameters, so edited element data
+    gets a fresh tone. ``preload`` fills the bank from a daemon thread,
+    which ``stop`` ends before the mixer is shut down.
+    """
+    def __init__(self, max_bytes: int = SOUND_BANK_MAX_BYTES, volume: float = 0.3):
+        self.max_bytes = max_bytes
+        self.volume = volume
+        self.sounds: 'OrderedDict[Tuple[float, float, str], Tuple[pygame.mixer.Sound, int]]' = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.preloader: Optional[threading.Thread] = None
+
+    def get(self, element: ElementRecord) -> pygame.mixer.Sound:
+        key = element.tone
+        with self.lock:
+            entry = self.sounds.get(key)
+            if entry is not None:
+                self.sounds.move_to_end(key)
+                return entry[0]
+        
+        frequency, duration, wave_type = key
+        samples = synthesize_tone(frequency, duration, self.volume, wave_type=wave_type)
+        sound = pygame.sndarray.make_sound(samples)
+        with self.lock:
+            if key not in self.sounds:
+                self.sounds[key] = (sound, samples.nbytes)
+                self.total_bytes += samples.nbytes
+                while self.total_bytes > self.max_bytes and len(self.sounds) > 1:
+                    _, (_, size) = self.sounds.popitem(last=False)
+                    self.total_bytes -= size
+            return self.sounds.get(key, (sound, 0))[0]
+
+    def preload(self, elements: List[ElementRecord]) -> threading.Thread:
+        def run() -> None:
+            for element in elements:
+                if self.stopped.is_set() or self.total_bytes >= self.max_bytes:
+                    break
+                self.get(element)
+        self.preloader = threading.Thread(target=run, daemon=True)
+        self.preloader.start()
+        return self.preloader
+
+    def stop(self) -> None:
+        """End preloading and wait for the tone in progress, if any."""
+        self.stopped.set()
+        if self.preloader is not None:
+            self.preloader.join(timeout=2)
+
+    def play(self, element: ElementRecord) -> None:
+        self.get(element).play()
+
+def build_wavetables(size: int = WAVETABLE_SIZE) -> Dict[str, np.ndarray]:
+    """Single-cycle tables for each wave type ``generate_tone`` supports."""
+    t = np.arange(size) / size
+    return {
+        'sine': np.sin(2 * np.pi * t).astype(np.float32),
+        'square': np.sign(np.sin(2 * np.pi * t)).astype(np.float32),
+        'sawtooth': (2 * (t - np.floor(0.5 + t))).astype(np.float32),
+        'triangle': (2 * np.abs(2 * (t - np.floor(t + 0.5))) - 1).astype(np.float32),
+    }
+
+class SynthVoice:
+    __slots__ = ('table', 'frequency', 'phase', 'gain', 'target')
+
+    def __init__(self, table: np.ndarray, frequency: float):
+        self.table = table
+        self.frequency = frequency
+        self.phase = 0.0
+        self.gain = 0.0
+        self.target = 1.0
+
+class StreamingSynth:
+    """Wavetable drone synth streamed to a reserved mixer channel.
+
+    A feeder thread renders ``chunk`` samples at a time into a small ring of
+    reusable Sounds and queues them on the channel, so memory and latency
+    stay flat however long a drone plays. Changing the drone crossfades the
+    old voice out while the new one fades in.
+    """
+    def __init__(self, volume: float = 0.2, chunk: int = SYNTH_CHUNK_SAMPLES,
+                 crossfade: float = SYNTH_CROSSFADE, ring_size: int = 3):
+        self.volume = volume
+        self.chunk = chunk
+        self.crossfade = crossfade
+        self.ring_size = ring_size
+        self.tables = build_wavetables()
+        self.voices: List[SynthVoice] = []
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.channel: Optional[pygame.mixer.Channel] = None
+        self.ring: List[pygame.mixer.Sound] = []
+        self.sample_rate = 44100
+
+    def set_drone(self, frequency: float, wave_type: str = 'sine') -> None:
+        with self.lock:
+            for voice in self.voices:
+                voice.target = 0.0
+            self.voices.append(SynthVoice(self.tables[wave_type], frequency))
+
+    def silence(self) -> None:
+        with self.lock:
+            for voice in self.voices:
+                voice.target = 0.0
+
+    def render(self, frames: int) -> np.ndarray:
+        """Mix the next ``frames`` mono samples as float32 in [-1, 1]."""
+        out = np.zeros(frames, dtype=np.float32)
+        size = WAVETABLE_SIZE
+        ramp = np.arange(1, frames + 1, dtype=np.float32) / max(1.0, self.crossfade * self.sample_rate)
+        with self.lock:
+            for voice in self.voices:
+                step = voice.frequency * size / self.sample_rate
+                position = voice.phase + step * np.arange(frames)
+                voice.phase = (voice.phase + step * frames) % size
+                index = position.astype(np.int64) % size
+                frac = (position - np.floor(position)).astype(np.float32)
+                table = voice.table
+                samples = table[index] + (table[(index + 1) % size] - table[index]) * frac
+                
+                if voice.gain < voice.target:
+                    gains = np.minimum(voice.gain + ramp, voice.target)
+                elif voice.gain > voice.target:
+                    gains = np.maximum(voice.gain - ramp, voice.target)
+                else:
+                    gains = voice.gain
+                out += samples * gains
+                voice.gain = float(gains if np.isscalar(gains) else gains[-1])
+            self.voices = [v for v in self.voices if v.gain > 0 or v.target > 0]
+        return out
+
+    def start(self) -> None:
+        if self.running or not pygame.mixer.get_init():
+            return
+        self.sample_rate, _, channels = pygame.mixer.get_init()
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
+        self.ring = [pygame.sndarray.make_sound(np.zeros((self.chunk, channels), dtype=np.int16))
+                     for _ in range(self.ring_size)]
+        self.running = True
+        self.thread = threading.Thread(target=self._feed, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.channel is not None:
+            self.channel.stop()
+
+    def _feed(self) -> None:
+        chunk_time = self.chunk / self.sample_rate
+        slot = 0
+        while self.running:
+            if self.channel.get_queue() is None:
+                sound = self.ring[slot]
+                slot = (slot + 1) % len(self.ring)
+                mono = self.render(self.chunk) * (self.volume * (2**15 - 1))
+                buffer = pygame.sndarray.samples(sound)
+                buffer[:] = mono.astype(np.int16)[:, None]
+                del buffer
+                if self.channel.get_busy():
+                    self.channel.queue(sound)
+                else:
+                    self.channel.play(sound)
+            time.sleep(chunk_time / 4)
+
+def play_element_sound(element: ElementRecord) -> None:
+    app.sound_bank.play(element)
+
+def play_element_drone(element: ElementRecord) -> None:
+    app.synth.start()
+    app.synth.set_drone(element.tone_frequency, element.wave_type)
+
+def select_element(element: ElementRecord) -> None:
+    app.game_state.selected_element_key = element.key
+    app.game_state.current_element = element
+    play_element_sound(element)
+    if app.game_state.drone:
+        play_element_drone(element)
+    app.game_state.transition.start_transition()
+
+# ======================
+# Frame Update and Input Handling
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation ticks.
+
+    Each frame's elapsed time is banked and paid out in whole ``tick`` ms
+    steps; the unspent remainder becomes ``alpha``, how far rendering should
+    interpolate from the previous tick towards the latest one. At most
+    ``max_steps`` ticks run per frame and any further backlog is dropped, so
+    a slow frame cannot snowball into slower ones.
+    """
+    def __init__(self, tick: float = SIM_TICK_MS, max_steps: int = MAX_SIM_STEPS):
+        self.tick = tick
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.time = 0.0
+    
+    def ticks(self, elapsed: int):
+        """Yield the simulation time of each tick due after ``elapsed`` ms."""
+        self.accumulator += elapsed
+        steps = min(int(self.accumulator // self.tick), self.max_steps)
+        self.accumulator = min(self.accumulator - steps * self.tick, math.nextafter(self.tick, 0))
+        for _ in range(steps):
+            self.time += self.tick
+            yield self.time
+    
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.tick
+    
+    @property
+    def render_time(self) -> float:
+        """Simulation time matching the interpolated frame."""
+        return self.time - self.tick + self.accumulator
+
+def swap_element_index(index: ElementIndex) -> None:
+    """Install a reloaded table between frames, keeping the current element by atomic number."""
+    state = app.game_state
+    number = state.current_element.atomic_number
+    if number not in index:
+        number = min(index.order, key=lambda n: abs(n - number))
+    app.element_index = index
+    element = index[number]
+    changed = element is not state.current_element
+    state.current_element = element
+    state.selected_element_key = element.key
+    state.max_progression = index.order[-1]
+    state.element_progression = min(state.element_progression, state.max_progression)
+    state.dirty_rects.mark_all()
+    if changed and state.drone:
+        play_element_drone(element)
+
+def update_simulation(current_time: float, dt: float) -> None:
+    offload = app.game_state.offload
+    with profiler.stage('simulate'):
+        app.game_state.background.update()
+        app.game_state.transition.update(dt)
+        if offload is not None:
+            offload.tick(current_time)
+            return
+        app.game_state.quantum_grid.update(app.game_state.current_element, current_time)
+    with profiler.stage('update_particles'):
+        update_particles(current_time)
+
+def render_frame(surface: pygame.Surface, current_time: float, alpha: float = 1.0,
+                 scale: Tuple[float, float] = (1.0, 1.0), hud: bool = True) -> Optional[List[pygame.Rect]]:
+    """Draw the scene; returns the dirty rects in dirty-rect mode, else None.
+
+    ``alpha`` interpolates moving layers between the last two simulation ticks.
+    The world is laid out in window pixels and drawn ``scale`` times that size
+    per axis; ``hud=False`` leaves the HUD for the caller to draw on the window.
+    """
+    width = round(surface.get_width() / scale[0])
+    height = round(surface.get_height() / scale[1])
+    app.game_state.view_size = (width, height)
+    center_x = round((width // 2 + app.game_state.camera_offset[0]) * scale[0])
+    center_y = round((height // 2 + app.game_state.camera_offset[1]) * scale[1])
+    status = status_line()
+    
+    if not app.game_state.dirty_rendering:
+        draw_scene(surface, center_x, center_y, current_time, status, alpha=alpha, scale=scale, hud=hud)
+        return None
+    
+    mark_dirty_layers(app.game_state.dirty_rects, surface, center_x, center_y, current_time, status,
+                      scale, hud)
+    dirty_rects = app.game_state.dirty_rects.collect()
+    if not dirty_rects:
+        return dirty_rects
+    # The background blends over the previous frame, so repainting a clean
+    # tile would not leave it unchanged. Draw the scene once over a copy of
+    # the dirty span and copy back just the dirty rects.
+    span = dirty_rects[0].unionall(dirty_rects[1:])
+    target = surface if len(dirty_rects) == 1 else app.game_state.dirty_rects.scratch(surface, span)
+    target.set_clip(span)
+    draw_scene(target, center_x, center_y, current_time, status,
+               app.game_state.dirty_rects.background_position, alpha, scale, hud)
+    target.set_clip(None)
+    if target is not surface:
+        surface.blits([(target, rect, rect) for rect in dirty_rects], doreturn=False)
+    return dirty_rects
+
+def handle_event(event: pygame.event.Event) -> bool:
+    """Apply one input event to the game state; returns False on quit."""
+    if event.type == pygame.QUIT:
+        return False
+    elif event.type == pygame.KEYDOWN:
+        if event.key in [pygame.K_SPACE, pygame.K_RIGHT]:
+            next_element = app.element_index.next(app.game_state.current_element.atomic_number)
+            app.game_state.element_progression = max(app.game_state.element_progression,
+                                                 next_element.atomic_number)
+            select_element(next_element)
+        elif event.key == pygame.K_LEFT:
+            select_element(app.element_index.previous(app.game_state.current_element.atomic_number))
+        elif event.key == pygame.K_i:
+            app.game_state.show_info = not app.game_state.show_info
+        elif event.key == pygame.K_o:
+            app.game_state.show_orbitals = not app.game_state.show_orbitals
+        elif event.key == pygame.K_e:
+            app.game_state.show_electrons = not app.game_state.show_electrons
+        elif event.key == pygame.K_r:
+            app.game_state.zoom = 1.0
+            app.game_state.camera_offset = [0, 0]
+        elif event.key == pygame.K_g:
+            app.game_state.quantum_grid.grid_alpha = 0 if app.game_state.quantum_grid.grid_alpha > 0 else GRID_ALPHA
+        elif event.key == pygame.K_d:
+            app.game_state.dirty_rendering = not app.game_state.dirty_rendering
+            app.game_state.dirty_rects.mark_all()
+        elif event.key == pygame.K_p:
+            profiler.show_overlay = not profiler.show_overlay
+            app.game_state.dirty_rects.mark_all()
+        elif event.key == pygame.K_t:
+            if profiler.trace_file is None:
+                profiler.start_trace(time.strftime(PROFILE_TRACE_PATH))
+            else:
+                profiler.stop_trace()
+        elif event.key == pygame.K_m:
+            app.game_state.drone = not app.game_state.drone
+            if app.game_state.drone:
+                play_element_drone(app.game_state.current_element)
+            else:
+                app.synth.silence()
+            
+    elif event.type == pygame.MOUSEBUTTONDOWN:
+        if event.button == 1:
+            app.game_state.dragging = True
+            app.game_state.last_mouse_pos = event.pos
+    elif event.type == pygame.MOUSEBUTTONUP:
+        if event.button == 1:
+            app.game_state.dragging = False
+    elif event.type == pygame.MOUSEMOTION:
+        if app.game_state.dragging:
+            dx = event.pos[0] - app.game_state.last_mouse_pos[0]
+            dy = event.pos[1] - app.game_state.last_mouse_pos[1]
+            app.game_state.camera_offset[0] += dx
+            app.game_state.camera_offset[1] += dy
+            app.game_state.last_mouse_pos = event.pos
+    elif event.type == pygame.MOUSEWHEEL:
+        zoom_factor = 1.1 if event.y > 0 else 0.9
+        app.game_state.zoom = max(0.5, min(2.0, app.game_state.zoom * zoom_factor))
+    return True
+
+# ======================
+# Simulation Offload
+class SharedSimulationState:
+    """One snapshot of particle and grid state in a shared-memory block.
+
+    The header holds ``(particle count, grid pulse phase, unlocked cells,
+    simulation time)``; every ``ParticlePool.COLUMNS`` and
+    ``QuantumGrid.STATE`` array follows at a 64-byte aligned offset.
+    """
+    def __init__(self, particles: ParticlePool, grid: QuantumGrid, name: Optional[str] = None):
+        fields = [('header', np.dtype(np.float64), (4,))]
+        fields += [(n, getattr(particles, n).dtype, getattr(particles, n).shape) for n in ParticlePool.COLUMNS]
+        fields += [(n, getattr(grid, n).dtype, getattr(grid, n).shape) for n in QuantumGrid.STATE]
+        offsets = []
+        size = 0
+        for _, dtype, shape in fields:
+            offsets.append(size)
+            size += -(-dtype.itemsize * int(np.prod(shape)) // 64) * 64
+        
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.name = self.shm.name
+        self.arrays = {n: np.ndarray(shape, dtype, buffer=self.shm.buf, offset=offset)
+                       for (n, dtype, shape), offset in zip(fields, offsets)}
+        self.header = self.arrays['header']
+    
+    def publish(self, particles: ParticlePool, grid: QuantumGrid, time: float) -> None:
+        n = particles.count
+        for name in ParticlePool.COLUMNS:
+            self.arrays[name][:n] = getattr(particles, name)[:n]
+        for name in QuantumGrid.STATE:
+            self.arrays[name][:] = getattr(grid, name)
+        self.header[:] = (n, grid.pulse_phase, grid.unlocked_cells, time)
+    
+    def restore(self, particles: ParticlePool, grid: QuantumGrid) -> None:
+        n = int(self.header[0])
+        for name in ParticlePool.COLUMNS:
+            getattr(particles, name)[:n] = self.arrays[name][:n]
+        for name in QuantumGrid.STATE:
+            getattr(grid, name)[:] = self.arrays[name]
+        particles.count = n
+        grid.pulse_phase = float(self.header[1])
+        grid.unlocked_cells = int(self.header[2])
+    
+    def bind(self, particles: ParticlePool, grid: QuantumGrid) -> None:
+        particles.bind(self.arrays, int(self.header[0]))
+        grid.bind(self.arrays, float(self.header[1]), int(self.header[2]))
+    
+    def close(self) -> None:
+        self.arrays = {}
+        self.header = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def simulation_worker(conn, names: List[str], capacity: int, width: int, height: int,
+                      seed: Optional[int]) -> None:
+    """Worker process loop: run batches of ticks and publish them to a snapshot."""
+    particles = ParticlePool(capacity, seed=seed)
+    grid = QuantumGrid(width, height)
+    snapshots = [SharedSimulationState(particles, grid, name) for name in names]
+    snapshots[0].restore(particles, grid)
+    last_emit = int(snapshots[0].header[3])
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            index, times, element, center, color = message
+            for current_time in times:
+                grid.update(element, current_time)
+                if current_time - last_emit > PARTICLE_EMIT_INTERVAL:
+                    emit_particles(particles, center, color)
+                    last_emit = current_time
+                particles.update()
+            snapshots[index].publish(particles, grid, last_emit)
+            conn.send(index)
+    finally:
+        for snapshot in snapshots:
+            snapshot.close()
+
+class SimulationOffload:
+    """Advances particles and the quantum grid in a worker process.
+
+    Two shared-memory snapshots alternate: the worker fills the back one
+    while this process draws from the front one, and they swap once the
+    worker reports a finished batch. Ticks that fall due while the worker is
+    busy are queued and sent as the next batch, with the element and camera
+    as they are at send time.
+    """
+    def __init__(self, state: 'GameState', seed: Optional[int] = None):
+        self.state = state
+        particles, grid = state.particles, state.quantum_grid
+        self.snapshots = [SharedSimulationState(particles, grid) for _ in range(2)]
+        self.snapshots[0].publish(particles, grid, state.last_particle_time)
+        self.front = 0
+        self.pending: List[int] = []
+        self.busy = False
+        
+        context = multiprocessing.get_context('spawn')
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=simulation_worker, daemon=True,
+            args=(child, [s.name for s in self.snapshots], particles.capacity,
+                  grid.width, grid.height, seed))
+        self.process.start()
+        child.close()
+        self.snapshots[0].bind(particles, grid)
+    
+    def tick(self, current_time: float) -> None:
+        self.pending.append(current_time)
+    
+    def sync(self) -> None:
+        """Swap in a finished snapshot and hand the worker any queued ticks.
+
+        If the worker has died, the offload is closed and the simulation
+        carries on in-process from the last finished snapshot.
+        """
+        try:
+            if self.busy and self.conn.poll():
+                self.front = self.conn.recv()
+                self.busy = False
+                self.snapshots[self.front].bind(self.state.particles, self.state.quantum_grid)
+            if not self.process.is_alive():
+                raise EOFError(f"exit code {self.process.exitcode}")
+            if not self.busy and self.pending:
+                element = self.state.current_element
+                self.conn.send((1 - self.front, self.pending, element, emitter_center(),
+                                element.particle_color))
+                self.pending = []
+                self.busy = True
+        except (EOFError, OSError) as e:
+            print(f"Simulation worker stopped ({e}); simulating in-process", file=sys.stderr)
+            self.close()
+    
+    def close(self) -> None:
+        """Stop the worker and copy the last snapshot back into private arrays."""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        front = self.snapshots[self.front]
+        particles, grid = self.state.particles, self.state.quantum_grid
+        particles.bind({name: np.array(column) for name, column in front.arrays.items()},
+                       particles.count)
+        grid.bind({name: np.array(front.arrays[name]) for name in QuantumGrid.STATE},
+                  grid.pulse_phase, grid.unlocked_cells)
+        for snapshot in self.snapshots:
+            snapshot.close()
+        self.state.offload = None
+
+# ======================
+# Headless Simulation
+def load_input_script(path: str) -> Dict[int, List[pygame.event.Event]]:
+    """Parse ``<frame> <key>`` lines (e.g. ``30 right``) into per-frame key events.
+
+    Blank lines and ``#`` comments are ignored; ``<frame> quit`` ends the run.
+    """
+    app.init_pygame()
+    script: Dict[int, List[pygame.event.Event]] = {}
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            try:
+                frame, name = line.split(None, 1)
+                if name.lower() == 'quit':
+                    event = pygame.event.Event(pygame.QUIT)
+                else:
+                    event = pygame.event.Event(pygame.KEYDOWN, key=pygame.key.key_code(name.lower()),
+                                               mod=0, unicode='', scancode=0)
+                script.setdefault(int(frame), []).append(event)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: bad script line {line!r}: {e}") from None
+    return script
+
+def state_digest() -> str:
+    """Hash of the simulation state, for comparing deterministic runs."""
+    particles = app.game_state.particles
+    grid = app.game_state.quantum_grid
+    digest = hashlib.sha1()
+    n = particles.count
+    for column in (particles.position[:n], particles.velocity[:n], particles.size[:n],
+                   particles.life[:n], grid.phase, grid.energy, grid.active):
+        digest.update(np.ascontiguousarray(column).tobytes())
+    digest.update(repr((app.game_state.current_element.atomic_number,
+                        app.game_state.background.bg_offset,
+                        app.game_state.transition.transition_time)).encode())
+    return digest.hexdigest()
+
+def run_headless(frames: int, seed: int = 0, dt: float = SIM_TICK_MS,
+                 script: Optional[Dict[int, List[pygame.event.Event]]] = None,
+                 render: bool = False) -> Dict:
+    """Step the simulation ``frames`` times on a fixed timestep, as fast as possible.
+
+    The game state is rebuilt from ``seed`` first, so the same seed, timestep
+    and script always produce the same ``state_digest``.
+    """
+    random.seed(seed)
+    app.game_state = GameState(seed=seed)
+    script = script or {}
+    current_time = 0
+    completed = 0
+    
+    start = time.perf_counter()
+    for frame in range(frames):
+        profiler.begin_frame()
+        if not all([handle_event(event) for event in script.get(frame, ())]):
+            break
+        current_time += dt
+        update_simulation(current_time, dt)
+        if render:
+            render_frame(app.screen, current_time)
+        profiler.end_frame()
+        completed += 1
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'frames': completed,
+        'seed': seed,
+        'dt_ms': dt,
+        'rendered': render,
+        'wall_seconds': elapsed,
+        'frames_per_second': completed / elapsed if elapsed > 0 else None,
+        'element': app.game_state.current_element.atomic_number,
+        'particles': app.game_state.particles.count,
+        'active_cells': len(app.game_state.quantum_grid.active_cells),
+        'digest': state_digest(),
+        'stages_ms': {name: dict(zip(('p50', 'p95', 'p99'), profiler.percentiles(name)))
+                      for name in profiler.samples},
+    }
 
 # ======================
 # Main Game Loop
-def main() -> None:
+def main(offload: bool = SIMULATION_OFFLOAD, hot_reload: bool = TABLE_HOT_RELOAD,
+         target: Optional[RenderTarget] = None) -> None:
     running = True
+    app.init_display()
+    target = target or RenderTarget()
+    app.sound_bank.preload([app.element_index[n] for n in app.element_index.order])
+    if offload:
+        app.game_state.offload = SimulationOffload(app.game_state)
+    watcher = TableWatcher(app.table_path) if hot_reload else None
+    if watcher is not None:
+        watcher.start()
+    timestep = FixedTimestep()
     last_time = pygame.time.get_ticks()
 
     while running:
+        profiler.begin_frame()
+        if watcher is not None:
+            index = watcher.take()
+            if index is not None:
+                swap_element_index(index)
         current_time = pygame.time.get_ticks()
-        dt = current_time - last_time
+        elapsed = current_time - last_time
         last_time = current_time
         
-        game_state.background.update()
-        game_state.quantum_grid.update(game_state.current_element, current_time)
-        game_state.transition.update(dt)
-        update_particles()
+        for sim_time in timestep.ticks(elapsed):
+            update_simulation(sim_time, timestep.tick)
+        if app.game_state.offload is not None:
+            with profiler.stage('sync'):
+                app.game_state.offload.sync()
+        window = pygame.display.get_surface()
+        surface = target.begin(window, current_time)
+        scaled = surface is not window
+        dirty_rects = render_frame(surface, timestep.render_time, timestep.alpha,
+                                   target.view_scale(), hud=not scaled)
+        with profiler.stage('scale'):
+            dirty_rects = target.present(window, dirty_rects)
+        if scaled:
+            draw_hud(window, status_line())
+            profiler.draw_overlay(window, timestep.render_time)
         
-        game_state.background.draw(screen)
-        game_state.quantum_grid.draw(screen)
-        
-        center_x = screen.get_width() // 2 + game_state.camera_offset[0]
-        center_y = screen.get_height() // 2 + game_state.camera_offset[1]
-        
-        for particle in game_state.particles:
-            particle.draw(screen)
-        
-        draw_element_visual(screen, game_state.current_element, center_x, center_y, current_time)
-        draw_element_info(screen, game_state.current_element, 50, 300)
-        draw_controls(screen)
-        
-        status_text = small_font.render(
-            f"Element {game_state.current_element['atomic_number']} of {len(periodic_table)} | "
-            f"Quantum Grid: {len(game_state.quantum_grid.active_cells)}/{game_state.quantum_grid.unlocked_cells} active",
-            True,
-            TEXT_COLOR
-        )
-        screen.blit(status_text, (screen.get_width() - 400, 20))
-        
-        game_state.transition.draw(screen)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key in [pygame.K_SPACE, pygame.K_RIGHT]:
-                    current_atomic_number = game_state.current_element['atomic_number']
-                    available_atomic_numbers = sorted(
-                        e['atomic_number'] for e in periodic_table.values()
-                    )
-                    current_index = available_atomic_numbers.index(current_atomic_number)
-                    next_index = (current_index + 1) % len(available_atomic_numbers)
-                    next_atomic_number = available_atomic_numbers[next_index]
-                    
-                    game_state.element_progression = max(game_state.element_progression, next_atomic_number)
-                    
-                    for key, elem in periodic_table.items():
-                        if elem['atomic_number'] == next_atomic_number:
-                            game_state.selected_element_key = key
-                            game_state.current_element = elem
-                            play_element_sound(game_state.current_element)
-                            game_state.transition.start_transition()
-                            break
-                            
-                elif event.key == pygame.K_LEFT:
-                    current_atomic_number = game_state.current_element['atomic_number']
-                    available_atomic_numbers = sorted(
-                        e['atomic_number'] for e in periodic_table.values()
-                    )
-                    current_index = available_atomic_numbers.index(current_atomic_number)
-                    prev_index = (current_index - 1) % len(available_atomic_numbers)
-                    prev_atomic_number = available_atomic_numbers[prev_index]
-                    
-                    for key, elem in periodic_table.items():
-                        if elem['atomic_number'] == prev_atomic_number:
-                            game_state.selected_element_key = key
-                            game_state.current_element = elem
-                            play_element_sound(game_state.current_element)
-                            game_state.transition.start_transition()
-                            break
-                            
-                elif event.key == pygame.K_i:
-                    game_state.show_info = not game_state.show_info
-                elif event.key == pygame.K_o:
-                    game_state.show_orbitals = not game_state.show_orbitals
-                elif event.key == pygame.K_e:
-                    game_state.show_electrons = not game_state.show_electrons
-                elif event.key == pygame.K_r:
-                    game_state.zoom = 1.0
-                    game_state.camera_offset = [0, 0]
-                elif event.key == pygame.K_g:
-                    game_state.quantum_grid.grid_alpha = 0 if game_state.quantum_grid.grid_alpha > 0 else GRID_ALPHA
-                    
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    game_state.dragging = True
-                    game_state.last_mouse_pos = event.pos
-            elif event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1:
-                    game_state.dragging = False
-            elif event.type == pygame.MOUSEMOTION:
-                if game_state.dragging:
-                    dx = event.pos[0] - game_state.last_mouse_pos[0]
-                    dy = event.pos[1] - game_state.last_mouse_pos[1]
-                    game_state.camera_offset[0] += dx
-                    game_state.camera_offset[1] += dy
-                    game_state.last_mouse_pos = event.pos
-            elif event.type == pygame.MOUSEWHEEL:
-                zoom_factor = 1.1 if event.y > 0 else 0.9
-                game_state.zoom = max(0.5, min(2.0, game_state.zoom * zoom_factor))
-
-        pygame.display.flip()
-        clock.tick(FPS)
-
-    pygame.quit()
+        with profiler.stage('events'):
+            for event in pygame.event.get():
+                if not handle_event(event):
+                    running = False
+
+        with profiler.stage('flip'):
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
+        profiler.end_frame()
+        app.clock.tick(FPS)
+
+    profiler.stop_trace()
+    if watcher is not None:
+        watcher.stop()
+    app.shutdown()
     sys.exit()
 
+def parse_size(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Proton Fusion Drift - Quantum Evolution Edition")
+    parser.add_argument('--headless', action='store_true',
+                        help="run the simulation without a display and print a JSON summary")
+    parser.add_argument('--frames', type=int, default=600, help="frames to simulate headless")
+    parser.add_argument('--seed', type=int, default=0, help="RNG seed for headless runs")
+    parser.add_argument('--dt', type=float, default=SIM_TICK_MS, help="fixed timestep in ms")
+    parser.add_argument('--script', help="scripted input file of '<frame> <key>' lines")
+    parser.add_argument('--render', action='store_true', help="also draw each headless frame")
+    parser.add_argument('--profile', action='store_true', help="start with the profiling overlay shown")
+    parser.add_argument('--offload', action='store_true',
+                        help="advance particles and the quantum grid in a worker process")
+    parser.add_argument('--render-size', type=parse_size, metavar='WxH',
+                        help="render at this fixed internal resolution and scale to the window")
+    parser.add_argument('--render-scale', type=float, default=RENDER_SCALE,
+                        help="internal resolution as a fraction of the window size")
+    parser.add_argument('--smooth-scale', action='store_true',
+                        help="filter when scaling the internal resolution to the window")
+    parser.add_argument('--no-hot-reload', action='store_true',
+                        help="do not reload the periodic table when its file changes")
+    parser.add_argument('--compile-table', nargs='*', metavar='JSON',
+                        help="compile periodic table JSON files (default: the active table) "
+                             "to memory-mappable .npy files and exit")
+    parser.add_argument('--trace', help="record a frame trace to this file (.jsonl for JSON lines, "
+                                        "otherwise Chrome trace format)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.compile_table is not None:
+        failed = False
+        for path in args.compile_table or [PERIODIC_TABLE_PATH]:
+            try:
+                print(f"{path} -> {compile_periodic_table(path)}")
+            except (OSError, ValueError) as e:
+                print(f"{path}: not compiled: {e}", file=sys.stderr)
+                failed = True
+        sys.exit(1 if failed else 0)
+    if args.headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    profiler.show_overlay = args.profile
+    if args.trace:
+        profiler.start_trace(args.trace)
+    if args.headless:
+        script = load_input_script(args.script) if args.script else None
+        print(json.dumps(run_headless(args.frames, args.seed, args.dt, script, args.render), indent=2))
+        profiler.stop_trace()
+    else:
+        target = RenderTarget(args.render_size or RENDER_RESOLUTION, args.render_scale,
+                              args.smooth_scale or RENDER_SMOOTH_SCALE)
+        main(args.offload or SIMULATION_OFFLOAD, TABLE_HOT_RELOAD and not args.no_hot_reload, target)
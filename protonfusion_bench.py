@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Proton Fusion Drift - Frame-Time Benchmarks
+Times each render subsystem headless and writes comparable JSON results.
+"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+import protonfusion as pf
+
+# ======================
+# Defaults
+PARTICLE_COUNTS = [100, 1000, 10000, 30000]
+GRID_SIZES = [(10, 8), (50, 50), (100, 100)]
+RESOLUTIONS = [(1024, 768), (1920, 1080)]
+ELEMENTS = range(1, 119)
+GRID_ACTIVE_SHARE = 0.02
+
+# ======================
+# Timing
+def time_frames(step: Callable[[int], None], frames: int, warmup: int) -> Dict:
+    """Run ``step(frame)`` and summarize the per-call wall time in ms."""
+    for frame in range(warmup):
+        step(frame)
+    samples = np.empty(frames)
+    for frame in range(frames):
+        start = time.perf_counter()
+        step(warmup + frame)
+        samples[frame] = time.perf_counter() - start
+    samples *= 1000
+    return {
+        'frames': frames,
+        'mean_ms': float(samples.mean()),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'max_ms': float(samples.max()),
+    }
+
+@contextmanager
+def resolution(width: int, height: int) -> Iterator[pygame.Surface]:
+    """Temporarily run the game at ``width`` x ``height`` with a fresh GameState."""
+    pf.app.init_display()
+    saved = (pf.SCREEN_WIDTH, pf.SCREEN_HEIGHT, pf.app.game_state)
+    pf.SCREEN_WIDTH, pf.SCREEN_HEIGHT = width, height
+    pf.app.game_state = pf.GameState(seed=0)
+    try:
+        yield pygame.Surface((width, height)).convert()
+    finally:
+        pf.SCREEN_WIDTH, pf.SCREEN_HEIGHT, pf.app.game_state = saved
+
+def frame_time(frame: int) -> int:
+    return frame * (1000 // pf.FPS)
+
+# ======================
+# Subsystem Benchmarks
+def bench_background(target: pygame.Surface, frames: int, warmup: int) -> Dict:
+    background = pf.app.game_state.background
+    def step(frame: int) -> None:
+        background.update()
+        background.draw(target)
+    return time_frames(step, frames, warmup)
+
+def grid_element(count: int) -> 'pf.ElementRecord':
+    """The heaviest element, renumbered so ``QuantumGrid.update`` unlocks ``count`` cells."""
+    element = pf.app.element_index[pf.app.element_index.order[-1]]
+    fields = dict(zip(pf.ElementRecord.SOURCE_FIELDS, element.source()))
+    fields['atomic_number'] = max(count, 1)
+    return pf.ElementRecord(**fields)
+
+def bench_grid(target: pygame.Surface, size: Tuple[int, int], frames: int, warmup: int) -> List[Dict]:
+    """Time a grid with every cell unlocked and ``GRID_ACTIVE_SHARE`` of them active.
+
+    Cells are shrunk so the whole grid fits on ``target``.
+    """
+    grid = pf.QuantumGrid(*size, seed=0)
+    width, height = target.get_size()
+    grid.cell_size = max(2, min((width - 2 * grid.grid_offset[0]) // size[0],
+                                (height - grid.grid_offset[1] - grid.grid_offset[0]) // size[1]))
+    pf.app.game_state.quantum_grid = grid
+    count = size[0] * size[1]
+    element = grid_element(count)
+    update = time_frames(lambda f: grid.update(element, frame_time(f)), frames, warmup)
+    
+    grid.active[:] = False
+    active = max(2, int(count * GRID_ACTIVE_SHARE))
+    grid.active[np.random.default_rng(0).choice(count, min(active, count), replace=False)] = True
+    draw = time_frames(lambda f: grid.draw(target), frames, warmup)
+    params = {'grid': f"{size[0]}x{size[1]}", 'cell_size': grid.cell_size,
+              'unlocked': grid.unlocked_cells, 'active': len(grid.active_cells)}
+    return [
+        {'subsystem': 'QuantumGrid.update', 'params': params, **update},
+        {'subsystem': 'QuantumGrid.draw', 'params': params, **draw},
+    ]
+
+def bench_particles(target: pygame.Surface, count: int, frames: int, warmup: int) -> List[Dict]:
+    pool = pf.ParticlePool(capacity=max(count, 1), seed=0)
+    sprites = pf.GlowSpriteCache()
+    width, height = target.get_size()
+    rng = np.random.default_rng(0)
+
+    def refill() -> None:
+        pool.clear()
+        pool.spawn(rng.uniform(0, width, count), rng.uniform(0, height, count),
+                   pf.app.element_index[1].particle_color)
+
+    refill()
+    update = time_frames(lambda f: pool.update(), frames, warmup)
+    live_after = pool.count
+    refill()
+    draw = time_frames(lambda f: pool.draw(target, sprites), frames, warmup)
+    params = {'particles': count, 'live_after': live_after}
+    return [
+        {'subsystem': 'ParticlePool.update', 'params': params, **update},
+        {'subsystem': 'ParticlePool.draw', 'params': params, **draw},
+    ]
+
+def bench_element(target: pygame.Surface, atomic_number: int, frames: int, warmup: int) -> Dict:
+    element = pf.app.element_index[atomic_number]
+    center = (target.get_width() // 2, target.get_height() // 2)
+    result = time_frames(
+        lambda f: pf.draw_element_visual(target, element, *center, frame_time(f)), frames, warmup)
+    return {'subsystem': 'draw_element_visual', 'params': {'element': atomic_number}, **result}
+
+def bench_transition(target: pygame.Surface, frames: int, warmup: int) -> Dict:
+    transition = pf.app.game_state.transition
+    step_ms = transition.max_transition_time / max(1, frames + warmup)
+    def step(frame: int) -> None:
+        transition.transition_active = True
+        transition.transition_time = int(frame * step_ms)
+        transition.draw(target)
+    return time_frames(step, frames, warmup)
+
+def bench_hud(target: pygame.Surface, frames: int, warmup: int) -> List[Dict]:
+    element = pf.app.game_state.current_element
+    info = time_frames(lambda f: pf.draw_element_info(target, element, 50, 300), frames, warmup)
+    controls = time_frames(lambda f: pf.draw_controls(target), frames, warmup)
+    return [
+        {'subsystem': 'draw_element_info', 'params': {}, **info},
+        {'subsystem': 'draw_controls', 'params': {}, **controls},
+    ]
+
+# ======================
+# Runner
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(frames: int, warmup: int, particle_counts: List[int],
+                   grid_sizes: List[Tuple[int, int]], resolutions: List[Tuple[int, int]],
+                   elements: List[int], element_frames: int) -> Dict:
+    results = []
+    for width, height in resolutions:
+        with resolution(width, height) as target:
+            res = {'resolution': f"{width}x{height}"}
+            def record(entry: Dict) -> None:
+                entry['params'] = {**res, **entry['params']}
+                results.append(entry)
+
+            record({'subsystem': 'DynamicBackground.draw', 'params': {},
+                    **bench_background(target, frames, warmup)})
+            for size in grid_sizes:
+                for entry in bench_grid(target, size, frames, warmup):
+                    record(entry)
+            pf.app.game_state.quantum_grid = pf.QuantumGrid(seed=0)
+            for count in particle_counts:
+                for entry in bench_particles(target, count, frames, warmup):
+                    record(entry)
+            for atomic_number in elements:
+                if atomic_number in pf.app.element_index:
+                    record(bench_element(target, atomic_number, element_frames, min(warmup, 2)))
+            record({'subsystem': 'TransitionEffects.draw', 'params': {},
+                    **bench_transition(target, frames, warmup)})
+            for entry in bench_hud(target, frames, warmup):
+                record(entry)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'frames': frames,
+            'warmup': warmup,
+        },
+        'results': results,
+    }
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Per-subsystem frame-time benchmarks")
+    parser.add_argument('--frames', type=int, default=120, help="timed frames per case")
+    parser.add_argument('--warmup', type=int, default=10, help="untimed frames per case")
+    parser.add_argument('--element-frames', type=int, default=20, help="timed frames per element")
+    parser.add_argument('--particles', type=int, nargs='+', default=PARTICLE_COUNTS)
+    parser.add_argument('--grids', type=pf.parse_size, nargs='+', default=GRID_SIZES, metavar='WxH')
+    parser.add_argument('--resolutions', type=pf.parse_size, nargs='+', default=RESOLUTIONS, metavar='WxH')
+    parser.add_argument('--elements', type=int, nargs='+', default=list(ELEMENTS))
+    parser.add_argument('--quick', action='store_true',
+                        help="small sweep for smoke-testing the harness")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.frames, args.warmup, args.element_frames = 10, 2, 3
+        args.particles, args.grids = [1000], [(10, 8)]
+        args.resolutions, args.elements = [(1024, 768)], [1, 26, 118]
+    return args
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = run_benchmarks(args.frames, args.warmup, args.particles, args.grids,
+                            args.resolutions, args.elements, args.element_frames)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()